@@ -1,8 +1,9 @@
 
 from abc import ABC, abstractmethod
 from asyncio import current_task
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from console import arrowUp, arrowDown
+from estruturas import arvore_fenwick, heap_indexado
 import random
 
 import console
@@ -12,9 +13,12 @@ def logToFile(text):
         f.write(text + "\n")
 
 class algoritimo_base(ABC):
-    def __init__(self, preemptive=False):
+    def __init__(self, preemptive=False, quantum=None):
         self.name_algoritmo = self.__class__.__name__
         self.preemptive = preemptive
+        # Tempo que uma tarefa executa antes do escalonador ser chamado de novo;
+        # None = a cada time slice
+        self.quantum = quantum
 
     @abstractmethod
     def escalonar(self, processos):
@@ -22,83 +26,192 @@ class algoritimo_base(ABC):
         Método responsável por escalonar os processos.
         """
         raise NotImplementedError("Este método deve ser implementado por subclasses.")
-    
-class escalonador_fcfs(algoritimo_base):
+
+    def selecionar(self, processos, tempo_atual, k, ocupadas=()):
+        """
+        Escolhe até k processos para os k processadores livres, em ordem de
+        preferência. ocupadas são tarefas prontas que já estão em outros
+        processadores e não podem ser escolhidas.
+        Por padrão chama escalonar() k vezes tirando os já escolhidos.
+        """
+        if k == 1 and not ocupadas:
+            escolhido = self.escalonar(processos, tempo_atual)
+            return [escolhido] if escolhido is not None else []
+        restantes = [p for p in processos if p not in ocupadas]
+        escolhidos = []
+        while restantes and len(escolhidos) < k:
+            escolhido = self.escalonar(restantes, tempo_atual)
+            if escolhido is None:
+                break
+            escolhidos.append(escolhido)
+            restantes.remove(escolhido)
+        return escolhidos
+
+    def tarefa_chegou(self, tarefa, ordem):
+        """
+        Chamado pelo escalonador quando a tarefa chega na fila de prontos.
+        ordem é a posição da tarefa na lista do escalonador, usada para desempate.
+        """
+        pass
+
+    def tarefa_finalizou(self, tarefa):
+        """
+        Chamado pelo escalonador quando a tarefa termina e sai da fila de prontos.
+        """
+        pass
+
+class algoritimo_heap(algoritimo_base):
+    # Base para os algoritmos que sempre escolhem o processo de menor chave.
+    # A fila de prontos é um heap persistente: as tarefas entram ao chegar e
+    # saem ao finalizar, então cada decisão custa O(log n) em vez de ordenar
+    # todos os processos a cada tick.
+    # A ordem da tarefa entra no fim da chave para manter o desempate do
+    # sorted() estável que era usado antes (primeiro na lista de tarefas).
+    def __init__(self, preemptive=False):
+        super().__init__(preemptive=preemptive)
+        self.fila = heap_indexado()
+        self.ordem = {}
+
+    @abstractmethod
+    def chave(self, tarefa):
+        """
+        Chave de ordenação da tarefa; a menor chave é escalonada primeiro.
+        """
+        raise NotImplementedError("Este método deve ser implementado por subclasses.")
+
+    def tarefa_chegou(self, tarefa, ordem):
+        self.ordem[tarefa] = ordem
+        self.fila.push(tarefa, (*self.chave(tarefa), ordem))
+
+    def tarefa_finalizou(self, tarefa):
+        if tarefa in self.fila:
+            self.fila.remover(tarefa)
+        self.ordem.pop(tarefa, None)
+
+    def escalonar(self, processos, tempo_atual):
+        if not processos:
+            return None
+        return self.fila.topo()
+
+    def selecionar(self, processos, tempo_atual, k, ocupadas=()):
+        if k == 1 and not ocupadas:
+            return super().selecionar(processos, tempo_atual, k, ocupadas)
+        # Os k menores do heap, pulando os que estão em outros processadores
+        return self.fila.menores(k, ocupadas)
+
+class escalonador_fcfs(algoritimo_heap):
     def __init__(self, **kwargs):
         super().__init__(preemptive=False)
         self.name = "FCFS"
 
-    def escalonar(self, processos, tempo_atual):
+    def chave(self, tarefa):
         # Ordena os processos por tempo de chegada
-        if not processos:
-            return None
-        return sorted(processos, key=lambda p: p.chegada)[0]
+        return (tarefa.chegada,)
 
-class escalonador_sjf(algoritimo_base):
+class escalonador_sjf(algoritimo_heap):
     def __init__(self, **kwargs):
         preemptive = kwargs.get('preemptive', False)
         super().__init__(preemptive=preemptive)
         self.name = "SJF"
+        self.current_task = None
+        # Tarefas que estavam nos processadores na última chamada: só elas
+        # executaram desde então, então só a chave delas (tempo restante) muda
+        self.executando = set()
 
-    def escalonar(self, processos, tempo_atual):
+    def chave(self, tarefa):
         # Ordena os processos por tempo restante
         # Caso não seja preemptivo, tempo restante = burst time
-        if not processos:
-            return None
-        return sorted(processos, key=lambda p: (p.restante, p.prioridade))[0]
+        return (tarefa.restante, tarefa.prioridade)
+
+    def _atualizar_chaves(self, ocupadas):
+        for t in self.executando.union(ocupadas):
+            if t in self.fila:
+                self.fila.atualizar(t, (*self.chave(t), self.ordem[t]))
+
+    def escalonar(self, processos, tempo_atual):
+        self._atualizar_chaves(())
+        self.current_task = super().escalonar(processos, tempo_atual)
+        self.executando = {self.current_task} if self.current_task is not None else set()
+        return self.current_task
+
+    def selecionar(self, processos, tempo_atual, k, ocupadas=()):
+        if k == 1 and not ocupadas:
+            return super().selecionar(processos, tempo_atual, k, ocupadas)
+        self._atualizar_chaves(ocupadas)
+        escolhidos = super().selecionar(processos, tempo_atual, k, ocupadas)
+        self.executando = set(ocupadas).union(escolhidos)
+        return escolhidos
 
 class escalonador_rr(algoritimo_base):
     #escalonador Round Robin
     def __init__(self, **kwargs):
-        super().__init__(preemptive=True)
-        # Quantum é o time slice do escalonador
+        # Quantum: tempo que cada processo executa antes de ir para o fim da fila
+        # (padrão: o time slice do escalonador)
+        super().__init__(preemptive=True, quantum=kwargs.get('quantum'))
         self.name = f"RR"
-        self.fila = OrderedDict() # Fila de processos RR
-    def escalonar(self, processos, tempo_atual):
+        self.fila = deque() # Fila de processos RR
+        self.na_fila = set() # Processos prontos que estão na fila
+    # A fila só muda na chegada, no fim e na rotação de um processo.
+    # Processos finalizados saem do conjunto na hora, mas só são
+    # descartados da fila quando chegam na frente dela: O(1) amortizado.
+    def tarefa_chegou(self, tarefa, ordem):
         # Adiciona novos processos ao final da fila
-        # Se o processo já estiver na fila, não o adiciona novamente
-        for processo in processos:
-            if processo.nome not in self.fila:
-                self.fila[processo.nome] = processo
-                 
-        # Remove processos que não estão mais na lista de processos
-        self.fila = {k: v for k, v in self.fila.items() if v in processos}
-        # retorna o primeiro processo da fila
-        res = next(iter(self.fila.values())) if self.fila else None
-        if res is not None:
-            del self.fila[res.nome]  # dequeue
-            self.fila[res.nome] = res  # Rotaciona o primeiro processo para o final
+        if tarefa not in self.na_fila:
+            self.na_fila.add(tarefa)
+            self.fila.append(tarefa)
 
-        return res
+    def tarefa_finalizou(self, tarefa):
+        self.na_fila.discard(tarefa)
+
+    def escalonar(self, processos, tempo_atual):
+        escolhidos = self.selecionar(processos, tempo_atual, 1)
+        return escolhidos[0] if escolhidos else None
+
+    def selecionar(self, processos, tempo_atual, k, ocupadas=()):
+        if not processos:
+            return []
+        escolhidos = []
+        pulados = [] # Processos em outros processadores: mantêm o lugar na fila
+        while self.fila and len(escolhidos) < k:
+            res = self.fila.popleft()
+            # Descarta da frente da fila os processos que já finalizaram
+            if res not in self.na_fila:
+                continue
+            if res in ocupadas:
+                pulados.append(res)
+                continue
+            escolhidos.append(res)
+        self.fila.extendleft(reversed(pulados))
+        # Os escolhidos rotacionam para o final da fila
+        self.fila.extend(escolhidos)
+        return escolhidos
 
-class escalonador_priority(algoritimo_base):
+class escalonador_priority(algoritimo_heap):
     def __init__(self, **kwargs):
         preemptive = kwargs.get('preemptive', False)
         super().__init__(preemptive=preemptive)
         self.inverted = kwargs.get('inverted', False)  # Se True, a prioridade mais alta é a menor numérica
         self.name = f"Priority {arrowUp if self.inverted else arrowDown}"
 
-    def escalonar(self, processos, tempo_atual):
+    def chave(self, tarefa):
         # Ordena os processos por prioridade e tempo de chegada
-        if not processos:
-            return None
         if self.inverted:
-            return sorted(processos, key=lambda p: (-p.prioridade, p.chegada))[0]
-        return sorted(processos, key=lambda p: (p.prioridade, p.chegada))[0]
+            return (-tarefa.prioridade, tarefa.chegada)
+        return (tarefa.prioridade, tarefa.chegada)
 
-class escalonador_edf(algoritimo_base):
+class escalonador_edf(algoritimo_heap):
     def __init__(self, **kwargs):
         preemptive = kwargs.get('preemptive', False)
         super().__init__(preemptive=preemptive)
         self.name = "EDF"
         self.current_task = None
 
-    def escalonar(self, processos, tempo_atual):
+    def chave(self, tarefa):
         # Ordena os processos por deadline e prioridade
-        if not processos:
-            return None
+        return (tarefa.deadline, tarefa.prioridade)
 
-        self.current_task = sorted(processos, key=lambda p: (p.deadline, p.prioridade))[0]
+    def escalonar(self, processos, tempo_atual):
+        self.current_task = super().escalonar(processos, tempo_atual)
         return self.current_task
     
 class escalonador_lottery(algoritimo_base):
@@ -107,38 +220,69 @@ class escalonador_lottery(algoritimo_base):
         self.current_task = None
         super().__init__(preemptive=preemptive)
         self.name = "Lottery"
-        self.tickets = {}
+        # Gerador próprio: com a opção 'seed' o sorteio é reprodutível
+        self.random = random.Random(kwargs.get('seed'))
+        self.tickets = arvore_fenwick()  # Tickets de cada processo
+        self.posicoes = {}  # processo -> posição na árvore de tickets
+        self.processos = {}  # posição na árvore de tickets -> processo
+        self.livres = []  # Posições liberadas por processos que finalizaram
     # Reorna um processo aleatório da lista de processos
     # Cada processo tem um número de tickets, que é decrementado a cada vez que o processo é selecionado
     # O numero incial de tickets é 10 - burst time do processo
     # O processo selecionado perde 1 ticket e os outros ganham 1 ticket.
-    # Atualmente só funciona com sistema single core.
+    # Os tickets ficam numa árvore de Fenwick: sorteio e atualização custam O(log n)
+    # e o "+1 para todos" é um deslocamento global, sem tocar em cada processo.
+    # Cada processo que chega ocupa uma posição liberada por um processo que
+    # finalizou (ou uma nova, se não houver), então a árvore tem o tamanho das
+    # tarefas ativas e não o da entrada inteira, mesmo com um fluxo.
+    # Com vários processadores, sorteia k processos sem reposição.
+    def tarefa_chegou(self, tarefa, ordem):
+        n_tickets = max(1, int(10 - tarefa.duracao))
+        posicao = self.livres.pop() if self.livres else len(self.posicoes)
+        self.tickets.inserir(posicao, n_tickets)
+        self.posicoes[tarefa] = posicao
+        self.processos[posicao] = tarefa
+
+    def tarefa_finalizou(self, tarefa):
+        if tarefa in self.posicoes:
+            posicao = self.posicoes.pop(tarefa)
+            del self.processos[posicao]
+            self.tickets.remover(posicao)
+            self.livres.append(posicao)
+
     def escalonar(self, processos, tempo_atual):
+        escolhidos = self.selecionar(processos, tempo_atual, 1)
+        return escolhidos[0] if escolhidos else None
 
-        # adiciona novos processos à lista de tickets
-        for p in processos:
-            if p not in self.tickets.keys():
-                n_tickets = max(1, 10 - p.duracao)
-                self.tickets[p] = n_tickets
-                  
+    def selecionar(self, processos, tempo_atual, k, ocupadas=()):
+        if not processos or not self.posicoes:
+            return []
 
-        # Remove processos que não estão mais na lista de processos
-        self.tickets = {p: t for p, t in self.tickets.items() if p in processos}
-        
-        if not processos:
-            return None 
-        
-        res = [item for item, weight in self.tickets.items() for _ in range(weight)]
-        random.shuffle(res)
-        res = res[0] if res else None
-
-        # Decrementa o ticket do processo selecionado e incrementa os outros
-        for p in self.tickets:
-            if p == res:
-                self.tickets[p] = max(1, self.tickets[p] - 1)
-            else:
-                self.tickets[p] += 1
-        self.current_task = res
+        # Processos em outros processadores não participam do sorteio
+        fora = {self.posicoes[p]: self.tickets.peso(self.posicoes[p]) for p in ocupadas if p in self.posicoes}
+        for posicao in fora:
+            self.tickets.definir(posicao, 0)
+        # Sorteia k processos sem reposição
+        sorteados = {}
+        while len(sorteados) < k and self.tickets.total() > 0:
+            sorteado = self.tickets.buscar(self.random.randrange(self.tickets.total()))
+            sorteados[sorteado] = self.tickets.peso(sorteado)
+            self.tickets.definir(sorteado, 0)
+
+        if not sorteados:
+            # Todos os processos já estão em outros processadores: não houve sorteio
+            for posicao, anterior in fora.items():
+                self.tickets.definir(posicao, anterior)
+            return []
+
+        # Decrementa o ticket dos processos selecionados e incrementa os outros
+        self.tickets.somar_a_todos(1)
+        for posicao, anterior in fora.items():
+            self.tickets.definir(posicao, anterior + 1)
+        for posicao, anterior in sorteados.items():
+            self.tickets.definir(posicao, max(1, anterior - 1))
+        res = [self.processos[posicao] for posicao in sorteados]
+        self.current_task = res[0] if res else None
         return res
 
 class escalonador_hrrn(algoritimo_base):
@@ -147,6 +291,13 @@ class escalonador_hrrn(algoritimo_base):
         # Although HRRN is not preemptive, it can be used in a preemptive context
         super().__init__(preemptive=preemptive)
         self.name = "HRRN"
+        self.ordem = {}  # Desempate: posição do processo na lista de tarefas
+
+    def tarefa_chegou(self, tarefa, ordem):
+        self.ordem[tarefa] = ordem
+
+    def tarefa_finalizou(self, tarefa):
+        self.ordem.pop(tarefa, None)
 
     def escalonar(self, processos, tempo_atual):
         if not processos:
@@ -156,4 +307,4 @@ class escalonador_hrrn(algoritimo_base):
             espera = tempo_atual - p.chegada
             exec_time = p.duracao - p.restante
             return (espera + exec_time) / exec_time if exec_time > 0 else float('inf')
-        return sorted(processos, key=lambda p: (-hrrn_score(p, tempo_atual)))[0]
+        return min(processos, key=lambda p: (-hrrn_score(p, tempo_atual), self.ordem[p]))
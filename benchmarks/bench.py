@@ -0,0 +1,265 @@
+"""Benchmarks do simulador: cada algoritimo, preemptivo e não preemptivo, nos
+dois motores, em workloads gerados de vários tamanhos, sempre headless.
+
+    python benchmarks/bench.py rodar [-o benchmarks/baseline.json] [--completo | --tamanhos 10,1000,100000]
+    python benchmarks/bench.py comparar benchmarks/baseline.json novo.json [--limite 0.1]
+
+Os tamanhos padrão são 10, 1k e 100k tarefas; --completo inclui 1M. Cada
+caso roda num processo próprio, para que o pico de memória (RSS) seja só
+dele. O workload é gerado antes da simulação e a geração é reportada à parte
+(tempo e RSS), então rss_simulacao_mb é o que o escalonador precisou além
+das tarefas de entrada. Casos pequenos são repetidos até somar pelo menos --minimo segundos e
+o melhor tempo é o que vale. Um caso que passa de --tempo-maximo segundos é
+interrompido e marcado como esgotado, e os tamanhos maiores da mesma
+configuração não rodam (uma política que cresce de forma quadrática não
+prende a suíte por horas); um caso cuja projeção, pelo crescimento medido
+entre os dois tamanhos anteriores, passa de --tempo-maximo também fica
+esgotado sem rodar. Um caso que falha é marcado com o erro da
+mesma forma, sem perder o resto da suíte. Políticas que ignoram a opção
+preemptive (FCFS, RR) rodam só no modo que de fato usam."""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from math import log
+
+import tabulate
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import algoritimos
+import gerador
+from escalonador import MOTORES, escalonador as Escalonador
+from task import tabela_tarefas
+
+ALGORITMOS = ("fcfs", "sjf", "rr", "priority", "edf", "lottery", "hrrn")
+TAMANHOS = (10, 1000, 100000)
+TAMANHOS_COMPLETO = TAMANHOS + (1000000,)  # --completo
+# Métricas comparadas e se um valor maior é melhor
+METRICAS = {"ticks_s": True, "decisoes_s": True, "segundos": False, "rss_simulacao_mb": False}
+# Variações de memória abaixo disto (MB) são ruído do alocador, não regressão
+RUIDO_RSS_MB = 1.0
+
+
+def chave(caso):
+    return f"{caso['algoritmo']}|{'preemptivo' if caso['preemptivo'] else 'nao_preemptivo'}|{caso['motor']}|{caso['tarefas']}"
+
+
+def modos(algoritmo):
+    """Modos (preemptivo ou não) que o algoritimo de fato usa: FCFS e RR
+    ignoram a opção preemptive, então rodam num modo só."""
+    classe = getattr(algoritimos, "escalonador_" + algoritmo)
+    return sorted({classe(preemptive=p).preemptive for p in (True, False)}, reverse=True)
+
+
+def _contar(funcao, contador):
+    def contada(*args, **kwargs):
+        contador[0] += 1
+        return funcao(*args, **kwargs)
+    return contada
+
+
+def _rss_pico_mb():
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+
+
+def medir(algoritmo, preemptivo, motor, tarefas, seed=0, utilizacao=0.8, minimo=0.2):
+    """Simula um caso (no processo atual) e retorna as medidas."""
+    # O workload é gerado antes de medir; a simulação o recebe como fluxo,
+    # então as tarefas finalizadas são descartadas como num trace real
+    inicio = time.perf_counter()
+    tabela = tabela_tarefas.de_specs(gerador.gerar(tarefas, seed=seed, utilizacao=utilizacao))
+    geracao = time.perf_counter() - inicio
+    rss_workload = _rss_pico_mb()
+    melhor = None
+    gasto = 0.0
+    while melhor is None or gasto < minimo:
+        alg = getattr(algoritimos, "escalonador_" + algoritmo)(preemptive=preemptivo, seed=seed)
+        escalonador = Escalonador(alg, headless=True, motor=motor)
+        ticks, decisoes = [0], [0]
+        escalonador.tick = _contar(escalonador.tick, ticks)
+        escalonador.tick_evento = _contar(escalonador.tick_evento, ticks)
+        alg.selecionar = _contar(alg.selecionar, decisoes)
+        inicio = time.perf_counter()
+        escalonador.adicionar_fonte(tabela)
+        escalonador.simular_sync(0)
+        resultado = escalonador.resultado()
+        segundos = time.perf_counter() - inicio
+        gasto += segundos
+        if melhor is None or segundos < melhor["segundos"]:
+            melhor = {"segundos": segundos, "ticks": ticks[0], "decisoes": decisoes[0],
+                      "tempo_simulado": resultado["tempo_total"]}
+    melhor["ticks_s"] = melhor["ticks"] / melhor["segundos"]
+    melhor["decisoes_s"] = melhor["decisoes"] / melhor["segundos"]
+    # O pico inclui o interpretador e o workload gerado; a diferença é o que a simulação somou
+    melhor["geracao_s"] = geracao
+    melhor["rss_workload_mb"] = rss_workload
+    melhor["rss_pico_mb"] = _rss_pico_mb()
+    melhor["rss_simulacao_mb"] = melhor["rss_pico_mb"] - rss_workload
+    return melhor
+
+
+def projecao(medidos, tarefas):
+    """Tempo estimado de um caso com o número de tarefas dado, pelo expoente de
+    crescimento entre os dois últimos tamanhos medidos (nunca abaixo de linear).
+    None se ainda não há dois tamanhos medidos."""
+    if len(medidos) < 2 or medidos[-2]["segundos"] <= 0:
+        return None
+    a, b = medidos[-2:]
+    expoente = max(1.0, log(b["segundos"] / a["segundos"]) / log(b["tarefas"] / a["tarefas"]))
+    return b["segundos"] * (tarefas / b["tarefas"]) ** expoente
+
+
+def rodar(algoritmos, tamanhos, motores, seed, minimo, tempo_maximo):
+    """Roda todos os casos, cada um num subprocesso, e retorna o baseline."""
+    casos = {}
+    for algoritmo in algoritmos:
+        for preemptivo in modos(algoritmo):
+            for motor in motores:
+                medidos = []
+                for tarefas in sorted(tamanhos):
+                    caso = {"algoritmo": algoritmo, "preemptivo": preemptivo, "motor": motor, "tarefas": tarefas}
+                    estimado = projecao(medidos, tarefas)
+                    if estimado is not None and estimado > tempo_maximo:
+                        # Nem começa: esperar o tempo máximo só para confirmar a projeção custaria horas
+                        caso["esgotado"] = tempo_maximo
+                        caso["projecao_s"] = estimado
+                        casos[chave(caso)] = caso
+                        print(f"{chave(caso)}: projeção de {estimado:.0f}s passa de {tempo_maximo}s, "
+                              f"tamanhos maiores ignorados", file=sys.stderr)
+                        break
+                    try:
+                        saida = subprocess.run([sys.executable, os.path.abspath(__file__), "caso", json.dumps(caso),
+                                                "--seed", str(seed), "--minimo", str(minimo)],
+                                               capture_output=True, text=True, check=True, timeout=tempo_maximo).stdout
+                    except subprocess.TimeoutExpired:
+                        caso["esgotado"] = tempo_maximo
+                        casos[chave(caso)] = caso
+                        print(f"{chave(caso)}: mais de {tempo_maximo}s, tamanhos maiores ignorados", file=sys.stderr)
+                        break
+                    except subprocess.CalledProcessError as erro:
+                        # Guarda o fim do stderr (o traceback) e segue com as outras configurações
+                        caso["erro"] = erro.stderr.strip().splitlines()[-20:]
+                        casos[chave(caso)] = caso
+                        print(f"{chave(caso)}: falhou (código {erro.returncode}), tamanhos maiores ignorados\n"
+                              + "\n".join(caso["erro"]), file=sys.stderr)
+                        break
+                    caso.update(json.loads(saida))
+                    casos[chave(caso)] = caso
+                    medidos.append(caso)
+                    print(f"{chave(caso)}: {caso['segundos']:.3f}s, {caso['ticks_s']:.0f} ticks/s, "
+                          f"{caso['rss_simulacao_mb']:.1f} MB na simulação ({caso['rss_pico_mb']:.1f} MB de pico, "
+                          f"geração em {caso['geracao_s']:.1f}s)", file=sys.stderr)
+    return {"python": platform.python_version(), "maquina": platform.platform(),
+            "data": time.strftime("%Y-%m-%d %H:%M:%S"), "seed": seed, "tamanhos": sorted(tamanhos),
+            "tempo_maximo": tempo_maximo, "casos": casos}
+
+
+def escala(casos):
+    """Expoente de crescimento do tempo entre tamanhos consecutivos de cada
+    configuração: 1 = linear no número de tarefas, 2 = quadrático. Casos
+    esgotados aparecem como ">N s" e os que falharam como "erro"."""
+    grupos = {}
+    for caso in casos.values():
+        grupos.setdefault(chave(caso).rsplit("|", 1)[0], []).append(caso)
+    linhas = []
+    for nome, grupo in sorted(grupos.items()):
+        grupo.sort(key=lambda c: c["tarefas"])
+        linha = [nome] + [f">{c['esgotado']}s" if "esgotado" in c else "erro" if "erro" in c
+                          else f"{c['segundos'] * 1e6 / c['tarefas']:.1f}" for c in grupo]
+        medidos = [c for c in grupo if "esgotado" not in c and "erro" not in c]
+        expoentes = [log(b["segundos"] / a["segundos"]) / log(b["tarefas"] / a["tarefas"])
+                     for a, b in zip(medidos, medidos[1:]) if a["segundos"] > 0]
+        linha.append(" ".join(f"{e:.2f}" for e in expoentes))
+        linhas.append(linha)
+    tamanhos = sorted({c["tarefas"] for c in casos.values()})
+    return tabulate.tabulate(linhas, headers=["caso"] + [f"µs/tarefa n={n}" for n in tamanhos] + ["expoentes"])
+
+
+def comparar(base, novo, limite):
+    """Casos e métricas que pioraram mais que limite (fração) em relação ao baseline."""
+    regressoes = []
+    for nome, caso in novo["casos"].items():
+        antigo = base["casos"].get(nome)
+        if antigo is None or "esgotado" in antigo or "erro" in antigo:
+            continue
+        if "esgotado" in caso:
+            regressoes.append([nome, "segundos", f"{antigo['segundos']:.4g}", f">{caso['esgotado']}", "esgotado"])
+            continue
+        if "erro" in caso:
+            regressoes.append([nome, "segundos", f"{antigo['segundos']:.4g}", "-", "erro"])
+            continue
+        for metrica, maior_melhor in METRICAS.items():
+            if metrica not in antigo:
+                continue  # Baseline gravado antes da métrica existir
+            a, b = antigo[metrica], caso[metrica]
+            if a <= 0 or (metrica.startswith("rss") and abs(b - a) < RUIDO_RSS_MB):
+                continue
+            variacao = (b - a) / a
+            if (-variacao if maior_melhor else variacao) > limite:
+                regressoes.append([nome, metrica, f"{a:.4g}", f"{b:.4g}", f"{variacao:+.1%}"])
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do simulador de escalonamento",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    p_rodar = comandos.add_parser("rodar", help="roda os benchmarks e grava o resultado em JSON")
+    p_rodar.add_argument("-o", "--output", default=os.path.join(RAIZ, "benchmarks", "baseline.json"),
+                         help="arquivo JSON de saída")
+    p_rodar.add_argument("--tamanhos", default=None,
+                         help=f"números de tarefas, separados por vírgula (padrão: {','.join(map(str, TAMANHOS))})")
+    p_rodar.add_argument("--completo", action="store_true",
+                         help=f"usa os tamanhos {','.join(map(str, TAMANHOS_COMPLETO))} (inclui 1M tarefas)")
+    p_rodar.add_argument("--algoritmos", default=",".join(ALGORITMOS), help="algoritimos, separados por vírgula")
+    p_rodar.add_argument("--motores", default=",".join(MOTORES), help="motores, separados por vírgula")
+    p_rodar.add_argument("--seed", type=int, default=0, help="semente dos workloads")
+    p_rodar.add_argument("--minimo", type=float, default=0.2, help="tempo mínimo medido por caso (s)")
+    p_rodar.add_argument("--tempo-maximo", type=float, default=120,
+                         help="tempo máximo de um caso (s); os tamanhos maiores da mesma configuração são ignorados")
+    p_comparar = comandos.add_parser("comparar", help="compara um resultado com o baseline")
+    p_comparar.add_argument("base", help="baseline (JSON)")
+    p_comparar.add_argument("novo", help="resultado novo (JSON)")
+    p_comparar.add_argument("--limite", type=float, default=0.1,
+                            help="piora máxima aceita em cada métrica (fração: 0.1 = 10%%)")
+    p_caso = comandos.add_parser("caso", help=argparse.SUPPRESS)
+    p_caso.add_argument("caso")
+    p_caso.add_argument("--seed", type=int, default=0)
+    p_caso.add_argument("--minimo", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.comando == "caso":
+        # Um caso só, no seu próprio processo (chamado por rodar)
+        print(json.dumps(medir(**json.loads(args.caso), seed=args.seed, minimo=args.minimo)))
+    elif args.comando == "rodar":
+        if args.tamanhos is not None:
+            tamanhos = [int(n) for n in args.tamanhos.split(",")]
+        else:
+            tamanhos = TAMANHOS_COMPLETO if args.completo else TAMANHOS
+        resultado = rodar(args.algoritmos.split(","), tamanhos,
+                          args.motores.split(","), args.seed, args.minimo, args.tempo_maximo)
+        with open(args.output, "w") as f:
+            json.dump(resultado, f, indent=2)
+        print(escala(resultado["casos"]))
+    else:
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.novo) as f:
+            novo = json.load(f)
+        regressoes = comparar(base, novo, args.limite)
+        if regressoes:
+            print(tabulate.tabulate(regressoes, headers=["caso", "métrica", "baseline", "novo", "variação"]))
+            sys.exit(1)
+        print(f"Nenhuma regressão acima de {args.limite:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,35 @@
+from task import TaskRuntime
+
 
 class CAV:
     def __init__(self, id, escalonador=None):
         self.id = id  # Identificador único para cada CAV
         self.tarefas = []  # Lista de tarefas atribuídas a esse CAV
         self.escalonador = escalonador
+        self.fluxo = None  # Tarefas lidas sob demanda durante a simulação (fluxo_tarefas)
 
     def adicionar_tarefa(self, tarefa):
         self.tarefas.append(tarefa)
 
+    def adicionar_tabela(self, tabela):
+        """Adiciona todas as tarefas de uma tabela_tarefas, com um estado de execução novo."""
+        self.tarefas.extend(TaskRuntime(tabela))
+
+    def adicionar_fluxo(self, fluxo):
+        """Usa um fluxo de tarefas (iterável de TaskSpec ordenado por chegada),
+        lido pelo escalonador à medida que as chegadas se aproximam."""
+        self.fluxo = fluxo
+
 
-    def simular(self, delay=0.5):
+    def simular(self, velocidade=2, headless=False, fps=20):
         if self.escalonador:
+            if headless:
+                self.escalonador.headless = True
             for tarefa in self.tarefas:
                 self.escalonador.adicionar_tarefa(tarefa)
-            self.escalonador.simular_sync(delay)
+            if self.fluxo is not None:
+                self.escalonador.adicionar_fonte(self.fluxo)
+            self.escalonador.simular_sync(velocidade, fps)
 
     def get_statistics(self):
         result = {}
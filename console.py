@@ -1,5 +1,5 @@
 
-import os
+import layout
 def bold(text):
     """Return text formatted in bold."""
     return f'\x1b[1m{text}\x1b[0m'
@@ -35,56 +35,26 @@ def table(headers, rows):
     lines.append(line)
     return '\n'.join(lines)
 
-def mergeLines(sprite1:str, sprite2:str, padding=4):
-    lines1 = sprite1.split('\n')
-    #lines1_len = lines1.reduce(lambda x, y: max(x, len(y)), 0)
-    line1_len= getMaxWidth(lines1)
-    lines2 = sprite2.split('\n')
-    lines2_len = getMaxWidth(lines2)
-    max_lines = max(len(lines1), len(lines2))
-    merged_lines = []
-    for i in range(max_lines):
-        line1 = lines1[i] if i < len(lines1) else ''
-        line2 = lines2[i] if i < len(lines2) else ''
-        line1 = hcenter(line1, line1_len, ' ', 0)
-        line2 = hcenter(line2, lines2_len, ' ', 0)
-        merged_line = line1 + ' ' * padding + line2
-        merged_lines.append(merged_line)
-    merged_sprite = '\n'.join(merged_lines)
-    return merged_sprite
-
 def hcenter(text, width=None, char=' ', mode = 0):
     """Center text in a given width with a specified character."""
     if width is None:
-        width = os.get_terminal_size().columns
+        width = layout.tamanho_terminal().columns
     text = str(text)
     text_lines = text.split('\n')
-    res = ''
+    res = []
     for line in text_lines:
         if mode == 0:
-            while LineLength(line) < width:
-                if len(line) % 2 == 0:
-                    line = char + line 
-                else:
-                    line = line + char
+            line = layout.centralizar(line, width, char)
         elif mode == 1:
             line = " "*(width - LineLength(line)) + line 
         elif mode == 2:
              line =  line + " "*(width - LineLength(line))
-        res += line + '\n'
-    return res.rstrip('\n')
+        res.append(line)
+    return '\n'.join(res).rstrip('\n')
 
 def LineLength(text):
-    count = 0
-    open = False
-    for char in text:
-        if (char == '\x1b'):
-            open = True
-        elif (char == 'm' and open):
-            open = False
-        elif (not open):
-            count += 1
-    return count
+    """Visible length of text, ignoring ANSI escape sequences."""
+    return layout.largura(text)
 
 def mergeLinesWithSpaceBetween(sprite1:str, sprite2:str):
     lines1 = sprite1.split('\n')
@@ -96,25 +66,21 @@ def mergeLinesWithSpaceBetween(sprite1:str, sprite2:str):
     for i in range(len(lines2)):
         lines2[i] = lines2[i].ljust(line2_len)
     max_lines = max(len(lines1), len(lines2))
+    columns = layout.tamanho_terminal().columns
     merged_lines = []
     for i in range(max_lines):
         line1 = lines1[i] if i < len(lines1) else ''
         line2 = lines2[i] if i < len(lines2) else ''
+        # Espaço entre os dois blocos para ocupar a largura do terminal
         total_length = LineLength(line1) + LineLength(line2)
-        while total_length < os.get_terminal_size().columns - 4:
-            line1 += ' '
-            total_length = LineLength(line1) + LineLength(line2)
+        line1 += ' ' * (columns - 4 - total_length)
         merged_line = line1  + line2
         merged_lines.append(merged_line)
     merged_sprite = '\n'.join(merged_lines)
     return merged_sprite
 
 def getMaxWidth(textArray: list) -> int:
-    max_width = 0
-    for line in textArray:
-        if LineLength(line) > max_width:
-            max_width = LineLength(line)
-    return max_width
+    return layout.largura_maxima(textArray)
 
 def mergeLines(sprite1:str, sprite2:str, padding=4):
     lines1 = sprite1.split('\n')
@@ -127,8 +93,8 @@ def mergeLines(sprite1:str, sprite2:str, padding=4):
     for i in range(max_lines):
         line1 = lines1[i] if i < len(lines1) else ''
         line2 = lines2[i] if i < len(lines2) else ''
-        line1 = hcenter(line1, line1_len, ' ', 0)
-        line2 = hcenter(line2, lines2_len, ' ', 0)
+        line1 = layout.centralizar(line1, line1_len)
+        line2 = layout.centralizar(line2, lines2_len)
         merged_line = line1 + ' ' * padding + line2
         merged_lines.append(merged_line)
     merged_sprite = '\n'.join(merged_lines)
@@ -148,11 +114,11 @@ def home():
 
 def line():
     """Print a horizontal line across the console."""
-    print('\033[1;30m' + '#' * os.get_terminal_size().columns + '\x1b[0m', end='')
+    print('\033[1;30m' + '#' * layout.tamanho_terminal().columns + '\x1b[0m', end='')
 
 def hprint(text, mode= 0):
     """Print text centered in the console."""
-    print(hcenter(text,mode=mode, width=os.get_terminal_size().columns), end='\033[0k\n')
+    print(hcenter(text,mode=mode, width=layout.tamanho_terminal().columns), end='\033[0k\n')
 
 def fprint(text):
     """Print text and clear the rest of the line."""
@@ -0,0 +1,234 @@
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from task import TaskSpec, tabela_tarefas
+
+# Extensões dos arquivos lidos como fluxo de tarefas
+FORMATOS = (".jsonl", ".csv")
+
+# Workloads compilados: <pasta do .json>/.tarefas_compiladas/<hash do conteúdo>.bin
+PASTA_COMPILADOS = ".tarefas_compiladas"
+_MAGICO = b"CAVT"
+_VERSAO = 2
+_CABECALHO = struct.Struct("<4sII")  # mágico, versão, tamanho do cabeçalho json
+# Colunas numéricas da tabela_tarefas guardadas no arquivo compilado
+_COLUNAS = ("chegada", "duracao", "deadline", "deadline_absoluto", "prioridade", "cores", "sem_deadline")
+
+
+def _numero(texto):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+class fluxo_invalido(ValueError):
+    """Linha inválida num fluxo de tarefas. Como o fluxo é lido durante a
+    simulação, o erro pode aparecer no meio dela; a mensagem diz o arquivo e
+    a linha."""
+
+
+class fluxo_tarefas:
+    """Tarefas lidas uma a uma de um arquivo JSONL (um objeto por linha, com as
+    mesmas chaves das tasks do .json) ou CSV (com cabeçalho), ordenado por
+    chegada. O arquivo nunca é carregado inteiro: o escalonador pede a próxima
+    tarefa só quando a chegada dela está próxima. Cada iteração reabre o
+    arquivo, então o mesmo fluxo serve a várias simulações, e enviá-lo a um
+    worker copia só o caminho.
+
+    Cada linha passa pelas mesmas verificações das tasks do .json; uma linha
+    inválida levanta fluxo_invalido. A primeira tarefa já é lida ao criar o
+    fluxo, então um arquivo no formato errado falha antes de simular."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.formato = os.path.splitext(caminho)[1].lower()
+        if self.formato not in FORMATOS:
+            raise ValueError(f"Formato de fluxo deve ser um de {FORMATOS}")
+        for _ in self:
+            break
+
+    def __iter__(self):
+        anterior = float('-inf')
+        with open(self.caminho, "r", newline="") as f:
+            linhas = self._jsonl(f) if self.formato == ".jsonl" else self._csv(f)
+            for n, campos in linhas:
+                try:
+                    spec = validar_tarefa(f"{self.caminho}:{n}", campos)
+                except ValueError as erro:
+                    raise fluxo_invalido(str(erro)) from None
+                if spec.chegada < anterior:
+                    raise fluxo_invalido(f"{self.caminho}:{n}: tarefas fora de ordem de chegada")
+                anterior = spec.chegada
+                yield spec
+
+    def _jsonl(self, f):
+        for n, linha in enumerate(f, 1):
+            if linha.strip():
+                try:
+                    campos = json.loads(linha)
+                except json.JSONDecodeError as erro:
+                    raise fluxo_invalido(f"{self.caminho}:{n}: JSON inválido ({erro.msg})") from None
+                yield n, campos
+
+    def _csv(self, f):
+        # Campos vazios ficam com o valor padrão (deadline vazio = sem deadline)
+        for n, linha in enumerate(csv.DictReader(f), 2):
+            try:
+                campos = {k: v if k == "nome" else _numero(v) for k, v in linha.items() if v not in ("", None)}
+            except ValueError:
+                raise fluxo_invalido(f"{self.caminho}:{n}: valor não numérico") from None
+            yield n, campos
+
+
+def _e_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def validar_tarefa(onde, tarefa):
+    """Confere uma task (um dict) e retorna a TaskSpec dela. Levanta ValueError
+    começando por `onde` ("task 3", "arquivo.jsonl:4") se alguma chave ou
+    valor for inválido."""
+    try:
+        spec = TaskSpec(**tarefa)
+    except TypeError as erro:
+        raise ValueError(f"{onde}: {erro}") from None
+    if not isinstance(spec.nome, str):
+        raise ValueError(f"{onde}: nome deve ser texto")
+    if not _e_numero(spec.chegada) or spec.chegada < 0:
+        raise ValueError(f"{onde}: chegada deve ser um número não negativo")
+    if not _e_numero(spec.duracao) or spec.duracao <= 0:
+        raise ValueError(f"{onde}: duracao deve ser um número positivo")
+    if spec.deadline is not None and not _e_numero(spec.deadline):
+        raise ValueError(f"{onde}: deadline deve ser um número")
+    if not isinstance(spec.prioridade, int) or isinstance(spec.prioridade, bool):
+        raise ValueError(f"{onde}: prioridade deve ser inteira")
+    return spec
+
+
+def caminho_compilado(caminho, conteudo):
+    """Arquivo compilado correspondente ao conteúdo (bytes) do .json dado."""
+    chave = hashlib.blake2b(conteudo, digest_size=16).hexdigest()
+    return os.path.join(os.path.dirname(os.path.abspath(caminho)), PASTA_COMPILADOS, f"{chave}.bin")
+
+
+def compilar(caminho):
+    """Valida as tasks de um .json uma vez e grava a forma binária (colunas
+    da tabela_tarefas mais a tabela de nomes) em caminho_compilado(). As
+    outras chaves do json (algoritmos, sweep) vão junto, no cabeçalho.
+    Retorna o caminho do arquivo gravado."""
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    dados = json.loads(conteudo)
+    tabela = tabela_tarefas()
+    # Sem "tasks" o main usa as tarefas padrão: carregar_json() tem que retornar None, não uma tabela vazia
+    tem_tasks = "tasks" in dados
+    for i, t in enumerate(dados.pop("tasks", [])):
+        spec = validar_tarefa(f"task {i}", t)
+        tabela.adicionar(spec.nome, spec.chegada, spec.duracao, spec.deadline, spec.prioridade)
+
+    nomes = [nome.encode("utf-8") for nome in tabela.nomes]
+    inicios = [0]
+    for nome in nomes:
+        inicios.append(inicios[-1] + len(nome))
+    # Cada bloco começa num múltiplo de 8 bytes, para o cast dos memoryviews
+    blocos = [(c, getattr(tabela, c)) for c in _COLUNAS]
+    blocos += [("inicios_nomes", array('q', inicios)), ("nomes", b"".join(nomes))]
+    colunas = {}
+    posicao = 0
+    for nome, bloco in blocos:
+        visao = memoryview(bloco)
+        colunas[nome] = [posicao, visao.format, len(visao)]
+        posicao += -(-visao.nbytes // 8) * 8
+    cabecalho = json.dumps({"n": len(tabela), "tem_tasks": tem_tasks, "colunas": colunas, "extra": dados}).encode("utf-8")
+    cabecalho += b" " * (-(_CABECALHO.size + len(cabecalho)) % 8)
+
+    destino = caminho_compilado(caminho, conteudo)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporario = destino + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(_CABECALHO.pack(_MAGICO, _VERSAO, len(cabecalho)))
+        f.write(cabecalho)
+        for nome, bloco in blocos:
+            dados_bloco = memoryview(bloco).cast("B")
+            f.write(dados_bloco)
+            f.write(bytes(-dados_bloco.nbytes % 8))
+    # Troca atômica: um leitor nunca vê o arquivo pela metade
+    os.replace(temporario, destino)
+    return destino
+
+
+class _nomes_mapeados:
+    """Nomes das tarefas lidos do arquivo compilado sob demanda."""
+    __slots__ = ("_inicios", "_texto")
+
+    def __init__(self, inicios, texto):
+        self._inicios = inicios
+        self._texto = texto
+
+    def __len__(self):
+        return len(self._inicios) - 1
+
+    def __getitem__(self, i):
+        return str(self._texto[self._inicios[i]:self._inicios[i + 1]], "utf-8")
+
+
+class tabela_mapeada(tabela_tarefas):
+    """tabela_tarefas somente leitura sobre um arquivo compilado mapeado em
+    memória: as colunas são memoryviews do próprio arquivo, então carregar
+    não copia nem converte nada, e o sistema operacional compartilha as
+    páginas entre simulações e workers. Enviada a um worker, a tabela
+    leva só o caminho e é mapeada de novo do outro lado."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, versao, tamanho = _CABECALHO.unpack_from(self._mapa)
+        if magico != _MAGICO or versao != _VERSAO:
+            raise ValueError(f"{caminho}: não é um workload compilado (versão {_VERSAO})")
+        cabecalho = json.loads(self._mapa[_CABECALHO.size:_CABECALHO.size + tamanho])
+        self.extra = cabecalho["extra"]  # Chaves do json além de "tasks"
+        self.tem_tasks = cabecalho["tem_tasks"]  # Se o json tinha a chave "tasks"
+        memoria = memoryview(self._mapa)[_CABECALHO.size + tamanho:]
+        blocos = {}
+        for nome, (inicio, formato, n) in cabecalho["colunas"].items():
+            bloco = memoria[inicio:inicio + n * struct.calcsize(formato)]
+            blocos[nome] = bloco.cast(formato)
+        for coluna in _COLUNAS:
+            setattr(self, coluna, blocos[coluna])
+        self.nomes = _nomes_mapeados(blocos["inicios_nomes"], blocos["nomes"])
+
+    def __reduce__(self):
+        return tabela_mapeada, (self.caminho,)
+
+    def adicionar(self, *args, **kwargs):
+        raise TypeError("Tabela mapeada é somente leitura")
+
+
+def carregar_json(caminho):
+    """Lê um workload .json e retorna (chaves do json além de "tasks", tabela_tarefas
+    ou None se não houver tasks). Se o arquivo já foi compilado com o conteúdo
+    atual, as tasks vêm da forma binária mapeada em memória, sem parsear o json."""
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    compilado = caminho_compilado(caminho, conteudo)
+    if os.path.isfile(compilado):
+        try:
+            tabela = tabela_mapeada(compilado)
+            return tabela.extra, tabela if tabela.tem_tasks else None
+        except (ValueError, KeyError):
+            pass  # Versão antiga ou arquivo corrompido: lê o json
+    dados = json.loads(conteudo)
+    tabela = None
+    if "tasks" in dados:
+        # Lidas direto para a tabela, sem um objeto por tarefa
+        tabela = tabela_tarefas()
+        for t in dados.pop("tasks"):
+            tabela.adicionar(**t)
+    return dados, tabela
@@ -1,109 +1,383 @@
-import os
+import layout
+import threading
 import time
+from time import perf_counter_ns
 
-from math import floor, inf
+import heapq
+from math import ceil, floor, inf
+from operator import itemgetter
 from algoritimos import algoritimo_base, logToFile
-from snapshot import snapshot as Snapshot
-from task import TaskState, TarefaCAV
+from metricas import acumulador_metricas, custo_decisoes
+from gantt import gantt, instantTypeToColor
+from snapshot import instantType, timeline
+from tela import tela
+from task import TaskRuntime, TaskState, tabela_tarefas
 import console
 from enum import Enum
 import tabulate as tabulate
-class instantType(Enum):
-    OVERLOAD = 0
-    WAITING = 1
-    HALF_WAITING = 2
-    EXECUTING = 3
-    FINALIZED = 4
-    NOT_ON_LIST = 5
-
-def instantTypeToColor(type):
-    return {
-        instantType.OVERLOAD: "41",  # Red background
-        instantType.WAITING: "43",   # Yellow background
-        instantType.HALF_WAITING: "43",  # Yellow background
-        instantType.EXECUTING: "42", # Green background
-        instantType.FINALIZED: "44", # Blue background
-        instantType.NOT_ON_LIST: "0" 
-    }.get(type, "0")
+class evento(Enum):
+    CHEGADA = 0
+    CONCLUSAO = 1
+    FIM_QUANTUM = 2
+    FIM_SOBRECARGA = 3
+    OCIOSO = 4
 
+MOTORES = ("tick", "eventos")
+# Tarefas de um fluxo por bloco (tabela_tarefas + TaskRuntime compartilhados).
+# Um bloco é liberado quando todas as suas tarefas saem da memória
+BLOCO_FLUXO = 1024
+
+class nucleo:
+    """Estado de um processador do CAV."""
+    def __init__(self, id):
+        self.id = id
+        self.current_task = None
+        self.at_overload = False  # Processador em sobrecarga (troca de contexto)
+        self.preemptada = None  # Tarefa que saiu do processador na sobrecarga atual
+        self.quantum_restante = 0  # Time slices que ainda restam no quantum da tarefa atual
+        self.n_overload = 0  # Contador de sobrecargas deste processador
+        self.tempo_ocupado = 0  # Tempo gasto executando tarefas
 
 class escalonador:
-    def __init__(self, algoritmo, time_slice=1, sobrecarga=0.6):
+    def __init__(self, algoritmo, time_slice=1, sobrecarga=0.6, headless=False, motor="tick", nucleos=1, custo_decisao=0):
         if not isinstance(algoritmo, algoritimo_base):
             raise TypeError("Algoritmo deve ser uma instância de algoritimo_base")
+        if motor not in MOTORES:
+            raise ValueError(f"Motor deve ser um de {MOTORES}")
         self.preemptivo = algoritmo.preemptive
         self.tarefas = []
         self.algoritmo = algoritmo
         self.tempo = 0
-        self.current_task = None
+        if nucleos < 1:
+            raise ValueError("O número de processadores deve ser pelo menos 1")
+        self.nucleos = [nucleo(i) for i in range(nucleos)]  # Processadores do CAV
         self.time_slice = time_slice  # Tempo de slice para escalonamento
         self.overload_cost = sobrecarga # Custo de sobrecarga
-        self.at_overload = False  # Callback para sobrecarga
-        self.n_overload = 0  # Contador de sobrecargas
-        self.snapshots = []  # Lista de snapshots para armazenar o estado do escalonador
+        # Time slices que uma tarefa executa antes da próxima preempção
+        self.fatias_quantum = max(1, ceil(algoritmo.quantum / time_slice)) if algoritmo.quantum else 1
+        self.n_overload = 0  # Contador de sobrecargas (somando todos os processadores)
+        # Custo real das decisões do algoritmo: sempre medido; com custo_decisao > 0
+        # (t.u. por µs medido) também é somado à sobrecarga das trocas de contexto
+        self.decisoes = custo_decisoes()
+        self.custo_decisao = custo_decisao
+        self._sobrecarga_decisao = 0  # Sobrecarga extra da decisão deste tick (t.u.)
+        self.tempo_sobrecarga_decisao = 0  # Total somado à sobrecarga pelas decisões (t.u.)
+        self.historico = timeline()  # Histórico compacto (run-length) do estado das tarefas a cada tick
+        self.gantt = gantt(time_slice, sobrecarga)  # Desenho incremental do histórico
+        self.tela = tela()  # Saída do terminal com buffer duplo
+        # Ritmo em tempo real (modo ao vivo com velocidade > 0)
+        self.velocidade = 0  # Unidades de tempo simuladas por segundo (0 = sem limite)
+        self.atraso = 0.0  # Quanto a simulação está atrás do tempo real agora (s)
+        self.atraso_maximo = 0.0  # Maior atraso em relação ao tempo real (s)
+        self.ticks_atrasados = 0  # Ticks que terminaram depois do seu horário
+        self.quadros_descartados = 0  # Quadros não desenhados para a simulação alcançar o tempo real
         self.last_t = 0  # Último tempo registrado
+        self.headless = headless  # Se True, simula sem histórico nem saída no terminal
+        self.motor = motor  # "tick": avança um time slice por vez, "eventos": salta entre eventos
+        self._eventos = []  # Fila de prioridade de eventos futuros (motor de eventos)
+        self._seq_eventos = 0  # Desempate dos eventos com o mesmo tempo
+        # Tarefas ordenadas por (chegada, posição na lista); o cursor aponta para a próxima a chegar.
+        # A posição na lista é passada aos algoritmos para desempate.
+        self._por_chegada = []
+        self._cursor = 0
+        self._ordenado = True
+        self._fonte = None  # Iterador de TaskSpec ainda não lidas (fluxo de tarefas)
+        self._ultima_lida = -inf  # Chegada da última tarefa lida do fluxo
+        self._bloco = None  # TaskRuntime do bloco que recebe as próximas tarefas do fluxo
+        self.n_tarefas = 0  # Tarefas recebidas até agora (da lista e do fluxo)
+        self.prontas = {}  # Tarefas que já chegaram e não finalizaram (-> posição na lista), em ordem de chegada
+        self._chegadas = []  # (posição na lista, tarefa) que chegaram desde a última decisão do algoritmo
+        self.n_finalizadas = 0  # Contador de tarefas finalizadas
+        self.metricas = acumulador_metricas()  # Médias e percentis, atualizados a cada evento
+        self._espera_finalizadas = 0  # Soma das esperas das tarefas finalizadas (estatísticas ao vivo)
     
     def adicionar_tarefa(self, tarefa):
+        self._por_chegada.append((tarefa.chegada, self.n_tarefas, tarefa))
+        self._ordenado = False
+        self.n_tarefas += 1
         self.tarefas.append(tarefa)
+        if self.motor == "eventos":
+            # Só o motor de eventos consome a fila; no de tick ela cresceria com a entrada inteira
+            self._agendar(tarefa.chegada, evento.CHEGADA)
+        if not self.headless:
+            self.historico.adicionar_tarefa(tarefa)
 
-    def tick(self):
-        """Executa o algoritmo de escalonamento e retorna a próxima tarefa a ser executada."""
-        if not self.tarefas:
-            return 
-        
-        if self.current_task is not None and self.current_task.restante <= 0:
-            self.current_task.estado = TaskState.FINALIZADO
-
-        # Filtra as tarefas prontas e que já chegaram
-        valid_tasks = [t for t in self.tarefas if t.chegada <= self.tempo]
-        # Filtra as tarefas que não estão finalizadas
-        valid_tasks = [t for t in valid_tasks if t.estado != TaskState.FINALIZADO]
-        # Algoritimo não preemptivo:
-        if not self.preemptivo:
-            #Se estiver executando uma tarefa, não escalona outra
-            if self.current_task is not None and self.current_task.estado == TaskState.EXECUTANDO:
-                pass
+    def adicionar_fonte(self, fonte):
+        """Recebe as tarefas de um iterável de TaskSpec ordenado por chegada
+        (um fluxo_tarefas, por exemplo). As tarefas só são criadas quando a
+        chegada delas está próxima e, no modo headless, não ficam em
+        self.tarefas: ao finalizar, sobram só as métricas acumuladas, então a
+        memória depende das tarefas ativas e não do tamanho da entrada."""
+        self._fonte = iter(fonte)
+        self._abastecer()
+
+    def _abastecer(self):
+        # Lê do fluxo todas as tarefas que chegam até o tempo atual e mais uma,
+        # a próxima chegada (que os motores consultam para saber até onde saltar)
+        while self._fonte is not None and self._ultima_lida <= self.tempo:
+            spec = next(self._fonte, None)
+            if spec is None:
+                self._fonte = None
+                break
+            self._ultima_lida = spec.chegada
+            tarefa = self._tarefa_fluxo(spec)
+            if self.headless:
+                if self._por_chegada and spec.chegada < self._por_chegada[-1][0]:
+                    self._ordenado = False
+                self._por_chegada.append((spec.chegada, self.n_tarefas, tarefa))
+                self.n_tarefas += 1
+                if self.motor == "eventos":
+                    self._agendar(spec.chegada, evento.CHEGADA)
             else:
-                self.current_task = self.algoritmo.escalonar(valid_tasks, self.tempo)
-        # Algoritimo preemptivo:
-        else:
+                # O desenho precisa de todas as tarefas (tabela e histórico)
+                self.adicionar_tarefa(tarefa)
+
+    def _tarefa_fluxo(self, spec):
+        """Visão de uma tarefa do fluxo, guardada em colunas no bloco atual em
+        vez de uma tabela e um runtime próprios para cada tarefa."""
+        if self._bloco is None or len(self._bloco) >= BLOCO_FLUXO:
+            self._bloco = TaskRuntime(tabela_tarefas())
+        i = self._bloco.tabela.adicionar(spec.nome, spec.chegada, spec.duracao, spec.deadline, spec.prioridade)
+        return self._bloco.tarefa(i)
+
+    def _pendente(self):
+        """True enquanto houver tarefas por chegar ou por finalizar."""
+        return self.n_finalizadas < self.n_tarefas or self._fonte is not None
+
+    def _liberar_chegadas(self):
+        """Move para as prontas as tarefas que chegaram até o tempo atual.
+        O custo depende só de quantas tarefas chegam, não do total de tarefas."""
+        self._abastecer()
+        if not self._ordenado:
+            self._por_chegada[self._cursor:] = sorted(self._por_chegada[self._cursor:])
+            self._ordenado = True
+        while self._cursor < len(self._por_chegada) and self._por_chegada[self._cursor][0] <= self.tempo:
+            _, ordem, tarefa = self._por_chegada[self._cursor]
+            self._cursor += 1
+            self.prontas[tarefa] = ordem
+            self._chegadas.append((ordem, tarefa))
+        if self._cursor > 1024 and 2 * self._cursor > len(self._por_chegada):
+            # Descarta as entradas que já chegaram: com um fluxo a lista não cresce sem limite
+            del self._por_chegada[:self._cursor]
+            self._cursor = 0
+
+    def _escalonar(self):
+        """Finaliza as tarefas concluídas e decide qual tarefa ocupa cada processador.
+        Parte comum aos motores de tick e de eventos."""
+        self._sobrecarga_decisao = 0
+        for n in self.nucleos:
+            if n.current_task is not None and n.current_task.restante <= 0:
+                n.current_task.estado = TaskState.FINALIZADO
+                del self.prontas[n.current_task]
+                self._espera_finalizadas += n.current_task.wait_time or 0
+                self.n_finalizadas += 1
+                self.algoritmo.tarefa_finalizou(n.current_task)
+                n.current_task = None
+
+        # Tarefas que já chegaram e não estão finalizadas
+        self._liberar_chegadas()
+        valid_tasks = self.prontas.keys()
+        livres = [] # Processadores que recebem uma tarefa do algoritmo neste tick
+        for n in self.nucleos:
+            executando = n.current_task is not None and n.current_task.estado == TaskState.EXECUTANDO
+            # Algoritimo não preemptivo:
+            if not self.preemptivo:
+                #Se estiver executando uma tarefa, não escalona outra
+                if not executando:
+                    livres.append(n)
+            # Algoritimo preemptivo:
             # Se estamos em sobrecarga, não escalona outra tarefa
-            if self.at_overload:
-                self.at_overload = False  # Reseta o estado de sobrecarga
+            elif n.at_overload:
+                n.at_overload = False  # Reseta o estado de sobrecarga
+                n.preemptada = None
+            # Se a tarefa atual ainda tem quantum, continua executando sem chamar o algoritmo
+            elif executando and n.quantum_restante > 0:
                 pass
-            # Se há tarefas válidas, escalona uma nova tarefa
+            # Senão, escalona uma nova tarefa
             else:
-            # Se não há tarefa atual ou a tarefa atual está finalizada, escalona uma nova
-                old_task = self.current_task
-                if self.current_task is not None and self.current_task.estado == TaskState.EXECUTANDO:
-                    # Se a tarefa atual não está na lista de tarefas válidas, marca como pronta
-                    # e re-adiciona ela para ser escalonada novamente
-                    self.at_overload = True
-                    self.current_task.estado = TaskState.PRONTO
-                    valid_tasks.append(self.current_task)
-                # Proxima tarefa a ser executada
-                self.current_task = self.algoritmo.escalonar(valid_tasks, self.tempo)
-                # if old_task is not None and old_task != self.current_task and old_task.estado != TaskState.FINALIZADO:
-                #     self.at_overload = True
-                    
-        # Se temos sobrecarga, adiciona o custo de sobrecarga ao tempo
+                if executando:
+                    # Marca a tarefa atual como pronta para ser escalonada novamente
+                    # (ela continua nas prontas até finalizar) e cobra a troca de contexto
+                    n.at_overload = True
+                    n.preemptada = n.current_task
+                    n.current_task.estado = TaskState.PRONTO
+                livres.append(n)
+        if livres:
+            # Tarefas que continuam em outros processadores não podem ser escolhidas
+            ocupadas = {n.current_task for n in self.nucleos if n not in livres and n.current_task is not None}
+            self._entregar_chegadas()
+            # Proximas tarefas a serem executadas
+            inicio = perf_counter_ns()
+            escolhidas = self.algoritmo.selecionar(valid_tasks, self.tempo, len(livres), ocupadas)
+            micros = (perf_counter_ns() - inicio) / 1000
+            self.decisoes.registrar(micros, len(valid_tasks))
+            self._sobrecarga_decisao = micros * self.custo_decisao
+            self._distribuir(livres, escolhidas)
+
+    def _entregar_chegadas(self):
+        """Entrega ao algoritmo as tarefas que chegaram desde a última decisão,
+        na ordem da lista de tarefas (não na de chegada): a fila do RR fica
+        igual à de quando o algoritmo recebia a lista inteira a cada decisão."""
+        if self._chegadas:
+            self._chegadas.sort(key=itemgetter(0))
+            for ordem, tarefa in self._chegadas:
+                self.algoritmo.tarefa_chegou(tarefa, ordem)
+            self._chegadas.clear()
+
+    def _distribuir(self, livres, escolhidas):
+        """Atribui as tarefas escolhidas aos processadores livres. Uma tarefa
+        escolhida de novo continua no mesmo processador, evitando migração."""
+        mantidas = {n.current_task for n in livres}.intersection(escolhidas)
+        novas = iter([t for t in escolhidas if t not in mantidas])
+        for n in livres:
+            if n.current_task not in mantidas:
+                n.current_task = next(novas, None)
+            if n.current_task is None:
+                # Sem tarefa para este processador: não há troca de contexto
+                n.at_overload = False
+                n.preemptada = None
+            n.quantum_restante = self.fatias_quantum
+
+    def tick(self):
+        """Executa o algoritmo de escalonamento e retorna a próxima tarefa a ser executada."""
+        if not self.n_tarefas:
+            return 
+        
+        self._escalonar()
         self.last_t = self.tempo
-        if self.at_overload:
-            self.n_overload += 1
-            self.tempo += self.overload_cost
-            return
-        # Executa a tarefa atual se houver
-        if self.current_task:
-            self.current_task.estado = TaskState.EXECUTANDO
-            self.tempo += self.current_task.executar(self.tempo, self.time_slice)
+        passos = []
+        for n in self.nucleos:
+            # Se temos sobrecarga, o processador gasta o custo de sobrecarga
+            if n.at_overload:
+                passos.append(self._sobrecarregar(n))
+            # Executa a tarefa atual se houver
+            elif n.current_task:
+                passos.append(self._executar(n, 1))
+        if passos:
+            # O tick dura o passo mais longo entre os processadores: eles avançam
+            # juntos, então um processador em sobrecarga enquanto outro executa
+            # fica parado o resto do time slice (aproximação, ver README)
+            self.tempo += max(passos)
         else:
             #senão houver tarefa atual, apenas avança o tempo
             # para o proximo tick inteiro
             self.tempo = floor(self.tempo + self.time_slice)  # Avança o tempo se não houver tarefa atual
         return
-    
+
+    def tick_evento(self):
+        """Mesma decisão de tick(), mas salta direto para o próximo evento
+        (chegada, conclusão, fim de quantum ou fim de sobrecarga) em vez de
+        avançar um time slice por vez."""
+        if not self.n_tarefas:
+            return
+
+        self._escalonar()
+        self.last_t = self.tempo
+        executando = [n for n in self.nucleos if not n.at_overload and n.current_task]
+        if any(n.at_overload for n in self.nucleos):
+            fatias = 1
+            tipo = evento.FIM_SOBRECARGA
+        elif executando:
+            # Executa de uma vez todas as fatias até a próxima decisão do escalonador
+            fatias = min(self._fatias_ate_decisao(n) for n in executando)
+            tipo = evento.FIM_QUANTUM
+            chegada = self._proxima_chegada()
+            if len(executando) < len(self.nucleos) and chegada is not None:
+                # Um processador ocioso pega a próxima chegada no primeiro tick depois dela
+                ticks_ate_chegada = max(1, ceil((chegada - self.tempo) / self.time_slice))
+                if ticks_ate_chegada < fatias:
+                    fatias = ticks_ate_chegada
+                    tipo = evento.OCIOSO
+        else:
+            self._agendar(self._proximo_tick_ocioso(), evento.OCIOSO)
+            fatias = 0
+
+        passos = []
+        for n in self.nucleos if fatias else ():
+            if n.at_overload:
+                passos.append(self._sobrecarregar(n))
+            elif n.current_task:
+                passos.append(self._executar(n, fatias))
+                if n.current_task.restante <= 0:
+                    tipo = evento.CONCLUSAO
+        if passos:
+            self._agendar(self.tempo + max(passos), tipo)
+
+        # Descarta as chegadas no caminho: elas só importam no próximo ponto de decisão
+        t, _, tipo = heapq.heappop(self._eventos)
+        while tipo == evento.CHEGADA:
+            t, _, tipo = heapq.heappop(self._eventos)
+        self.tempo = t
+
+    def _sobrecarregar(self, n):
+        """Cobra uma troca de contexto do processador n e retorna a sua duração."""
+        n.n_overload += 1
+        self.n_overload += 1
+        if self._sobrecarga_decisao:
+            self.tempo_sobrecarga_decisao += self._sobrecarga_decisao
+            return self.overload_cost + self._sobrecarga_decisao
+        return self.overload_cost
+
+    def _agendar(self, tempo, tipo):
+        self._seq_eventos += 1
+        heapq.heappush(self._eventos, (tempo, self._seq_eventos, tipo))
+
+    def _executar(self, n, fatias):
+        """Executa fatias time slices da tarefa do processador n, atualizando as
+        métricas quando ela roda pela primeira vez, termina ou estoura o deadline."""
+        tarefa = n.current_task
+        tarefa.estado = TaskState.EXECUTANDO
+        primeira = tarefa.response_time is None
+        sem_retorno = tarefa.turn_around_time is None
+        falhou = tarefa.taskFailed
+        passo = tarefa.executar_fatias(self.tempo, self.time_slice, fatias)
+        n.quantum_restante -= fatias
+        n.tempo_ocupado += passo
+        if primeira:
+            self.metricas.inicio(tarefa)
+        if sem_retorno and tarefa.turn_around_time is not None:
+            self.metricas.fim(tarefa)
+        if not falhou and tarefa.taskFailed:
+            self.metricas.falha(tarefa, self.prontas[tarefa])
+        return passo
+
+    def _fatias_ate_decisao(self, n):
+        """Número de time slices que a tarefa do processador n executa antes do escalonador ser chamado de novo."""
+        if not float(self.time_slice).is_integer():
+            # Com time slices fracionários o motor de tick soma o tempo fatia a fatia e
+            # (t + ts) + ts pode diferir de t + 2*ts no último bit: avança uma fatia por vez
+            return 1
+        fatias = max(1, ceil(n.current_task.restante / self.time_slice))
+        if self.preemptivo:
+            # Preemptivo: o escalonador decide ao fim do quantum (padrão: a cada time slice)
+            return max(1, min(fatias, n.quantum_restante))
+        return fatias
+
+    def _proxima_chegada(self):
+        """Tempo de chegada da próxima tarefa que ainda não chegou (None se não houver)."""
+        if self._cursor < len(self._por_chegada):
+            return self._por_chegada[self._cursor][0]
+        return None
+
+    def _proximo_tick_ocioso(self):
+        """Tempo em que o processador ocioso encontra a próxima chegada, seguindo
+        os mesmos passos floor(tempo + time_slice) do motor de tick."""
+        proximo = floor(self.tempo + self.time_slice)
+        if not self._eventos or self._eventos[0][0] <= proximo:
+            return proximo
+        chegada = self._eventos[0][0]
+        passo = floor(self.time_slice)
+        if passo == 0:
+            # Com time slice < 1 o motor de tick nunca sai do lugar; aqui salta direto para a chegada
+            return ceil(chegada)
+        return proximo + ceil((chegada - proximo) / passo) * passo
+
     def print_history(self):
-        """Imprime o histórico de snapshots do escalonador."""
+        """Imprime o histórico de ticks do escalonador."""
+        self.tela.desenhar(self.montar_quadro())
+
+    def montar_quadro(self):
+        """Monta as linhas do quadro com o histórico de ticks do escalonador."""
         preemptable =  "Preemptável" if self.preemptivo else "Não Preemptável"
         preemptable = console.italic(preemptable)
         CYAN = "36"  # Cyan color for preemptable status
@@ -113,105 +387,28 @@ class escalonador:
         line = f"Simulando {self.algoritmo.name} ({preemptable}): "
         line += console.bold(f"T: {self.tempo:2.1f} ")
         line += f"{console.italic('t.u.')}"
+        if self.velocidade > 0:
+            line += console.italic(f" (atraso: {self.atraso:.2f}s, máx: {self.atraso_maximo:.2f}s)")
         frame = console.hcenter(line)
-        line = f"({console.italic(f'time slice: {self.time_slice}, custo sobrecarga: {self.overload_cost}')})"
+        nucleos = f", processadores: {len(self.nucleos)}" if len(self.nucleos) > 1 else ""
+        line = f"({console.italic(f'time slice: {self.time_slice}, custo sobrecarga: {self.overload_cost}{nucleos}')})"
         frame += "\n" + console.hcenter(line)
-        names = [t.nome for t in self.snapshots[0].processos]
+        names = [t.nome for t in self.historico.tarefas]
         max_len = max(len(name) for name in names)
         max_len = max(max_len, 10)  # Ensure minimum length for task names
         task_header = console.hcenter("Tarefas", max_len + 2 + 2)
 
         # task_frame += "\n" + "-"* (max_len + 2)
-        max_ticks = (os.get_terminal_size().columns - len(task_header)) // 6 - 7
-        task_frame = ""
-        for name in names:
-            task_frame += f"\n\033[1;37m{name.rjust(max_len)}\033[0m "
-            task_frame += "\n" + "-"* (max_len + 2) 
-        task_frame= task_frame[1:]
-        task_h = []
-        v_div = console.uline("|") + "\n|"* ((len(names) - 1)* 2 ) + "\n-"
+        max_ticks = (layout.tamanho_terminal().columns - len(task_header)) // 6 - 7
         avgs = {}
-        avgs["#N OVL"] = 0
+        avgs["#N OVL"] = self.n_overload
         avgs["#Fail"] = 0
         avgs["A: TAT"] = 0
         avgs["A: WT"] = 0
         avgs["A: RT"] = 0
-        counts = {}
-        last_exec = None
-        for i, s in enumerate(self.snapshots):
-            # imprime apenas os últimos max_ticks snapshots
-            if len(self.snapshots) - i > max_ticks:
-                if s.at_overload:
-                    avgs["#N OVL"] = avgs.get("#N OVL", 0) + 1
-                continue
-            this_time = []
-            if s.at_overload:
-                avgs["#N OVL"] = avgs.get("#N OVL", 0) + 1
-            for t in s.processos:
-                if s.at_overload and t.nome == last_exec:
-                    this_time.append((instantType.OVERLOAD, t.taskFailed))
-                elif t.estado == TaskState.EXECUTANDO:
-                    last_exec = t.nome
-                    this_time.append((instantType.EXECUTING, t.taskFailed))
-                elif t.estado == TaskState.PRONTO and s.tempo > t.chegada:
-                    last_t = self.snapshots[i - 1].tempo if i > 0 else 0
-                    if last_t < t.chegada:
-                        this_time.append((instantType.HALF_WAITING, t.taskFailed))
-                    else:
-                        this_time.append((instantType.WAITING, t.taskFailed))
-                elif t.estado == TaskState.FINALIZADO:
-                    this_time.append((instantType.FINALIZED, False))
-                else:
-                    this_time.append((instantType.NOT_ON_LIST, t.taskFailed))
-            SLOT_LEN = 5 
-            if s.at_overload:
-                    SLOT_LEN = floor( self.overload_cost /self.time_slice * SLOT_LEN)
-                    SLOT_LEN = max(SLOT_LEN, 4)
-            diff = SLOT_LEN + 1
-            
-            time_str =  f'{s.tempo:1.1f}'.rjust(diff)
-            
-            task_header += time_str
-            slice = ""
-            for t in this_time:
-                task_color = instantTypeToColor(t[0])
-                CHAR = " "
-                if t[1] == True:
-                    CHAR = "X"
-                if t[0] == instantType.HALF_WAITING:
-                    half = floor(SLOT_LEN / 2)
-                   
-                    slice += f"\n\033[{0}m{CHAR * half}\033[0m"  + f"\033[{task_color}m{CHAR * (SLOT_LEN - half)}\033[0m"
-                else:
-                    slice += f"\n\033[{task_color}m{CHAR * SLOT_LEN}\033[0m"
-                slice += "\n" + "-" * SLOT_LEN
-            
-            task_h.append(slice[1:])
-        task_frame = console.mergeLines(task_frame, v_div, 0)
-        for spr in task_h:
-            task_frame = console.mergeLines(task_frame, spr, 0)
-            task_frame = console.mergeLines(task_frame, v_div, 0)
-
-        headers = ["Cheg", "Burs", "Prio", "Dead"]
-        headers = [console.bold(h) for h in headers]
-        data = []
-        for t in self.tarefas:
-            deadline = t.deadline
-            if str(t.deadline) == "inf":
-                deadline = "---"
-            if t.estado == TaskState.FINALIZADO and deadline != "---":
-                if t.taskFailed:
-                    deadline = console.insert_color(deadline, "1;31")
-                else:
-                    deadline = console.insert_color(deadline, "1;32")
-            data.append([ t.chegada, t.duracao, t.prioridade, deadline])
-        table = tabulate.tabulate(
-            headers=headers,
-            tabular_data=data,
-            disable_numparse=True,
-            stralign="center",
-            tablefmt="fancy_grid",
-            )
+        # Só as colunas novas são desenhadas; as visíveis ficam em cache no gantt
+        task_header, task_frame = self.gantt.quadro(self.historico, max_ticks, task_header, max_len)
+        table = self.gantt.tabela(self.tarefas, self.n_finalizadas)
         task_frame = "\n\n" + console.insert_color(task_header, "1;4") + "\n" + task_frame
         task_frame = console.mergeLinesWithSpaceBetween(task_frame, table)
         frame += "\n" + task_frame
@@ -222,29 +419,29 @@ class escalonador:
             legenda += f" \033[{instantTypeToColor(it)}m{it.name}\033[0m"
         legenda += f" [XXXX]: Tarefa Falhou"   
 
-        for t in self.tarefas:
-            if t.taskFailed:
-                avgs["#Fail"] += 1
-            if t.turn_around_time is not None:
-                avgs["A: TAT"] = avgs.get("A: TAT", 0) + t.turn_around_time
-                counts["A: TAT"] = counts.get("A: TAT", 0) + 1
-            if  self.tempo >= t.chegada :
-                if t.estado == TaskState.FINALIZADO:
-                    wait_time = t.wait_time
-                else:
-                    service_time = t.duracao - t.restante
-                    fake_tat = self.tempo - t.chegada
-                    wait_time = fake_tat - service_time
-                if not wait_time:
-                    wait_time = 0
-                avgs["A: WT"] = avgs.get("A: WT", 0) + wait_time
-                counts["A: WT"] = counts.get("A: WT", 0) + 1
-            if t.response_time is not None:
-                avgs["A: RT"] = avgs.get("A: RT", 0) + t.response_time
-                counts["A: RT"] = counts.get("A: RT", 0) + 1
-        for k, v in avgs.items():
-            if k in counts and counts[k] > 0:
-                avgs[k] = f"{v / counts[k]:.2f}"
+        # Estatísticas ao vivo: falhas, retorno e resposta vêm do acumulador de
+        # métricas; a espera inclui a das tarefas que já chegaram e ainda não
+        # finalizaram, então percorre só essas (não a lista inteira)
+        m = self.metricas
+        avgs["#Fail"] = m.falhas
+        if m.retorno.n:
+            avgs["A: TAT"] = f"{m.retorno.media():.2f}"
+        espera, n_espera = self._espera_finalizadas, self.n_finalizadas
+        # O quadro só lê o estado: com um fluxo entram as tarefas já lidas pelo último tick
+        ativas = list(self.prontas)
+        i = self._cursor
+        while i < len(self._por_chegada) and self._por_chegada[i][0] <= self.tempo:
+            ativas.append(self._por_chegada[i][2])
+            i += 1
+        for t in ativas:
+            service_time = t.duracao - t.restante
+            fake_tat = self.tempo - t.chegada
+            espera += fake_tat - service_time
+        n_espera += len(ativas)
+        if n_espera:
+            avgs["A: WT"] = f"{espera / n_espera:.2f}"
+        if m.resposta.n:
+            avgs["A: RT"] = f"{m.resposta.media():.2f}"
         table_data = [[*avgs.keys()], [*avgs.values()]]
         table_live_stat = tabulate.tabulate(
             tabular_data = table_data,
@@ -258,43 +455,113 @@ class escalonador:
         # frame += "\n\n" + console.hcenter(table)
         # table = console.table(headers=TarefaCAV.__dict__.keys(), rows=[t.__dict__.values() for t in self.tarefas])
         # frame += "\n\n" + console.hcenter(table)
-        lcount = os.get_terminal_size().lines - 1
-        console.home()
-        for line in frame.split("\n"):
-            lcount -= 1
-            console.fprint(line)
-            if lcount <= 0:
-                break
-        for i in range(lcount):
-            console.fprint("")
+        return frame.split("\n")
+
+    def registrar_tick(self):
+        """Registra o tick atual no histórico."""
+        em_sobrecarga = [n.preemptada for n in self.nucleos if n.at_overload]
+        executando = [n.current_task for n in self.nucleos]
+        self.historico.registrar(self.tempo, any(n.at_overload for n in self.nucleos), executando, em_sobrecarga)
 
     def take_snapshot(self):
-        """Tira um instantâneo do estado atual do escalonador."""
-        self.snapshots.append(Snapshot(self.tarefas, self.tempo, self.algoritmo, self.preemptivo, self.at_overload))
+        """Registra o tick atual no histórico e redesenha a tela."""
+        self.registrar_tick()
         self.print_history()
     
-    def simular_sync(self, delay=0.5):
-        """Executa o escalonador até todas as tarefas serem finalizadas."""
-        while not all(t.estado == TaskState.FINALIZADO for t in self.tarefas):
-            self.tick()
-            self.take_snapshot()
-            time.sleep(delay)
-        
-    
+    def simular_sync(self, velocidade=2, fps=20):
+        """Executa o escalonador até todas as tarefas serem finalizadas.
+        velocidade é quantas unidades de tempo simuladas passam por segundo
+        (0 = sem limite). A simulação roda nesta thread e uma thread de
+        desenho mostra o estado mais recente fps vezes por segundo."""
+        passo = self.tick if self.motor == "tick" else self.tick_evento
+        if self.headless:
+            # Modo headless: sem histórico, renderização ou sleep, apenas simula
+            while self._pendente():
+                passo()
+            return
+
+        # Quem monta o quadro é a simulação, quando o desenho pede: assim o
+        # quadro nunca mostra um tick pela metade e não precisa de lock
+        self._pedido = threading.Event()  # Thread de desenho quer um quadro
+        self._quadro_pronto = threading.Event()
+        self._fim = threading.Event()
+        self._quadro = None
+        desenho = threading.Thread(target=self._desenhar, args=(fps,), daemon=True)
+        desenho.start()
+        self.velocidade = velocidade
+        self._ultimo_quadro = inicio = time.monotonic()
+        try:
+            while self._pendente():
+                passo()
+                self.registrar_tick()
+                if velocidade > 0:
+                    # O fim do tick tem horário marcado: inicio + tempo simulado / velocidade.
+                    # Como o horário é absoluto, o custo de simular e desenhar não acumula
+                    alvo = inicio + self.tempo / velocidade
+                    agora = time.monotonic()
+                    self.atraso = max(0.0, agora - alvo)
+                    if self.atraso > 0:
+                        self.ticks_atrasados += 1
+                        self.atraso_maximo = max(self.atraso_maximo, self.atraso)
+                        # Atrasado: descarta quadros para alcançar o tempo real, mas
+                        # desenha ao menos um por segundo
+                        if agora - self._ultimo_quadro < 1:
+                            continue
+                    while (espera := alvo - time.monotonic()) > 0:
+                        self._atender_pedido()
+                        self._pedido.wait(espera)
+                self._atender_pedido()
+        finally:
+            self._fim.set()
+            self._quadro_pronto.set()
+            desenho.join()
+        # Último quadro, com todas as tarefas finalizadas
+        self.print_history()
+
+    def _atender_pedido(self):
+        if self._pedido.is_set():
+            self._pedido.clear()
+            self._quadro = self.montar_quadro()
+            self._ultimo_quadro = time.monotonic()
+            self._quadro_pronto.set()
+
+    def _desenhar(self, fps):
+        """Laço da thread de desenho: pede um quadro à simulação a cada 1/fps segundos e o desenha."""
+        intervalo = 1 / fps
+        while not self._fim.is_set():
+            proximo = time.monotonic() + intervalo
+            self._pedido.set()
+            if self._quadro_pronto.wait(intervalo):
+                if not self._fim.is_set():
+                    self._quadro_pronto.clear()
+                    self.tela.desenhar(self._quadro)
+            else:
+                # A simulação não atendeu a tempo (está atrasada): quadro descartado
+                self.quadros_descartados += 1
+            self._fim.wait(max(0, proximo - time.monotonic()))
+
     def resultado(self):
+        """Métricas finais da simulação, como números (a formatação fica com quem exibe)."""
         results = {}
         # tira um time slice pois tem mais um ts para mostrar todos finalizados
-        results["tempo_total"] = f"{self.last_t:.2f}"
+        results["tempo_total"] = float(self.last_t)
         results["n_overload"] = self.n_overload
-        results["total_overload_time"] = f"{self.n_overload * self.overload_cost:.2f}"
-        results["n_processos"] = len(self.tarefas)
-        results["failed_processes"] = len([t for t in self.tarefas if t.taskFailed])
-        if results["failed_processes"] > 0:
-            results["failed_processes"] = f"{results['failed_processes']} ({','.join([t.nome for t in self.tarefas if t.taskFailed])})"
-        results["avg_turnaround_time"] = sum(t.turn_around_time for t in self.tarefas if t.turn_around_time is not None) / len(self.tarefas)
-        results["avg_turnaround_time"] = f"{results['avg_turnaround_time']:.2f}"
-        results["avg_wait_time"] = sum(t.wait_time for t in self.tarefas if t.wait_time is not None) / len(self.tarefas)
-        results["avg_wait_time"] = f"{results['avg_wait_time']:.2f}"
-        results["avg_response_time"] = sum(t.response_time for t in self.tarefas if t.response_time is not None) / len(self.tarefas)
-        results["avg_response_time"] = f"{results['avg_response_time']:.2f}"
+        results["total_overload_time"] = float(self.n_overload * self.overload_cost + self.tempo_sobrecarga_decisao)
+        results["n_processos"] = self.n_tarefas
+        results["failed_processes"] = self.metricas.falhas
+        results["failed_names"] = self.metricas.nomes_falhas()
+        results.update(self.metricas.resumo(self.n_tarefas))
+        if len(self.nucleos) > 1:
+            # Fração do tempo total que cada processador passou executando tarefas
+            results["n_nucleos"] = len(self.nucleos)
+            results["utilizacao_nucleos"] = [n.tempo_ocupado / self.last_t if self.last_t > 0 else 0.0 for n in self.nucleos]
+        # Custo real das decisões do algoritmo (tempo de parede, não simulado)
+        results.update(self.decisoes.resumo())
+        if self.custo_decisao:
+            results["sobrecarga_decisao"] = float(self.tempo_sobrecarga_decisao)
+        if self.velocidade > 0 and not self.headless:
+            # Quanto a reprodução ao vivo ficou atrás do tempo real
+            results["atraso_maximo"] = self.atraso_maximo
+            results["ticks_atrasados"] = self.ticks_atrasados
+            results["quadros_descartados"] = self.quadros_descartados
         return results
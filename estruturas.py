@@ -0,0 +1,185 @@
+import heapq
+
+
+class heap_indexado:
+    """Heap binário de mínimo que guarda a posição de cada item.
+    Além de push/pop em O(log n), permite remover ou mudar a chave de
+    qualquer item em O(log n), sem precisar reconstruir o heap."""
+
+    def __init__(self):
+        self._heap = []  # Lista de (chave, item)
+        self._pos = {}  # item -> posição em self._heap
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def push(self, item, chave):
+        self._heap.append((chave, item))
+        self._pos[item] = len(self._heap) - 1
+        self._subir(len(self._heap) - 1)
+
+    def topo(self):
+        """Retorna o item de menor chave sem removê-lo (None se vazio)."""
+        return self._heap[0][1] if self._heap else None
+
+    def menores(self, k, ignorar=()):
+        """Retorna até k itens de menor chave, em ordem, pulando os de ignorar,
+        sem alterar o heap. Custa O((k + len(ignorar)) log k)."""
+        res = []
+        if not self._heap:
+            return res
+        candidatos = [(self._heap[0][0], 0)]
+        while candidatos and len(res) < k:
+            _, i = heapq.heappop(candidatos)
+            item = self._heap[i][1]
+            if item not in ignorar:
+                res.append(item)
+            for filho in (2 * i + 1, 2 * i + 2):
+                if filho < len(self._heap):
+                    heapq.heappush(candidatos, (self._heap[filho][0], filho))
+        return res
+
+    def pop(self):
+        item = self._heap[0][1]
+        self.remover(item)
+        return item
+
+    def remover(self, item):
+        i = self._pos.pop(item)
+        ultimo = self._heap.pop()
+        if i == len(self._heap):
+            return
+        # Move o último elemento para o buraco e restaura a ordem do heap
+        self._heap[i] = ultimo
+        self._pos[ultimo[1]] = i
+        self._subir(i)
+        self._descer(self._pos[ultimo[1]])
+
+    def atualizar(self, item, chave):
+        """Muda a chave de um item já presente no heap."""
+        i = self._pos[item]
+        antiga = self._heap[i][0]
+        self._heap[i] = (chave, item)
+        if chave < antiga:
+            self._subir(i)
+        else:
+            self._descer(i)
+
+    def _subir(self, i):
+        heap = self._heap
+        entrada = heap[i]
+        while i > 0:
+            pai = (i - 1) >> 1
+            if not entrada[0] < heap[pai][0]:
+                break
+            heap[i] = heap[pai]
+            self._pos[heap[i][1]] = i
+            i = pai
+        heap[i] = entrada
+        self._pos[entrada[1]] = i
+
+    def _descer(self, i):
+        heap = self._heap
+        n = len(heap)
+        entrada = heap[i]
+        while True:
+            filho = 2 * i + 1
+            if filho >= n:
+                break
+            if filho + 1 < n and heap[filho + 1][0] < heap[filho][0]:
+                filho += 1
+            if not heap[filho][0] < entrada[0]:
+                break
+            heap[i] = heap[filho]
+            self._pos[heap[i][1]] = i
+            i = filho
+        heap[i] = entrada
+        self._pos[entrada[1]] = i
+
+
+class arvore_fenwick:
+    """Árvore de Fenwick (binary indexed tree) de pesos inteiros, indexada
+    por posição. Inserir, remover, mudar o peso e sortear uma posição
+    proporcionalmente ao peso custam O(log n). somar_a_todos() soma um valor
+    ao peso de todos os itens presentes em O(1), guardando um deslocamento global."""
+
+    def __init__(self, capacidade=16):
+        self._n = capacidade
+        self._soma = [0] * (capacidade + 1)  # Fenwick das bases (1-indexado)
+        self._cont = [0] * (capacidade + 1)  # Fenwick das posições ocupadas
+        self._base = [0] * capacidade  # peso = base + deslocamento
+        self._ocupado = [False] * capacidade
+        self._deslocamento = 0
+        self._total_base = 0
+        self._quantidade = 0
+
+    def __len__(self):
+        return self._quantidade
+
+    def total(self):
+        """Soma dos pesos de todos os itens."""
+        return self._total_base + self._deslocamento * self._quantidade
+
+    def peso(self, i):
+        return self._base[i] + self._deslocamento
+
+    def inserir(self, i, peso):
+        """Ocupa a posição i com o peso dado."""
+        while i >= self._n:
+            self._crescer()
+        self._ocupado[i] = True
+        self._quantidade += 1
+        self._atualizar(i, peso - self._deslocamento, 1)
+
+    def remover(self, i):
+        self._ocupado[i] = False
+        self._quantidade -= 1
+        self._atualizar(i, -self._base[i], -1)
+
+    def definir(self, i, peso):
+        """Muda o peso do item na posição i."""
+        self._atualizar(i, peso - self._deslocamento - self._base[i], 0)
+
+    def somar_a_todos(self, delta):
+        self._deslocamento += delta
+
+    def buscar(self, alvo):
+        """Retorna a posição do item cujo intervalo acumulado de pesos contém alvo (0 <= alvo < total())."""
+        pos = 0
+        acumulado = 0
+        passo = 1 << self._n.bit_length()
+        while passo:
+            proximo = pos + passo
+            if proximo <= self._n:
+                peso_bloco = self._soma[proximo] + self._deslocamento * self._cont[proximo]
+                if acumulado + peso_bloco <= alvo:
+                    pos = proximo
+                    acumulado += peso_bloco
+            passo >>= 1
+        return pos
+
+    def _atualizar(self, i, delta_base, delta_cont):
+        self._base[i] += delta_base
+        self._total_base += delta_base
+        j = i + 1
+        while j <= self._n:
+            self._soma[j] += delta_base
+            self._cont[j] += delta_cont
+            j += j & -j
+
+    def _crescer(self):
+        # Dobra a capacidade e reconstrói as árvores em O(n)
+        antigo = self._n
+        self._n *= 2
+        self._base.extend([0] * antigo)
+        self._ocupado.extend([False] * antigo)
+        self._soma = [0] + self._base[:]
+        self._cont = [0] + [1 if o else 0 for o in self._ocupado]
+        for j in range(1, self._n + 1):
+            pai = j + (j & -j)
+            if pai <= self._n:
+                self._soma[pai] += self._soma[j]
+                self._cont[pai] += self._cont[j]
@@ -0,0 +1,123 @@
+from collections import deque
+from math import floor
+
+import tabulate as tabulate
+
+import console
+from snapshot import instantType
+from task import TaskState
+
+def instantTypeToColor(type):
+    return {
+        instantType.OVERLOAD: "41",  # Red background
+        instantType.WAITING: "43",   # Yellow background
+        instantType.HALF_WAITING: "43",  # Yellow background
+        instantType.EXECUTING: "42", # Green background
+        instantType.FINALIZED: "44", # Blue background
+        instantType.NOT_ON_LIST: "0"
+    }.get(type, "0")
+
+
+class gantt:
+    """Desenho incremental do gráfico de Gantt do print_history.
+    Cada coluna da timeline vira um sprite (cabeçalho com o tempo e duas linhas
+    por tarefa) uma única vez; os sprites visíveis ficam num buffer circular do
+    tamanho da largura do terminal, então cada quadro só desenha as colunas
+    novas e junta as visíveis, sem depender do tamanho do histórico. A tabela
+    de tarefas é refeita só quando alguma tarefa finaliza."""
+
+    def __init__(self, time_slice, overload_cost):
+        self.time_slice = time_slice
+        self.overload_cost = overload_cost
+        self._colunas = deque(maxlen=0)  # (tempo formatado, linhas da coluna)
+        self._proxima = 0  # Próxima coluna da timeline ainda não desenhada
+        self._n_tarefas = None
+        self._tabela = None  # (chave, tabela formatada)
+
+    def colunas(self, historico, max_ticks):
+        """Atualiza o buffer com as colunas novas do histórico e retorna os
+        sprites das últimas max_ticks colunas."""
+        max_ticks = max(max_ticks, 0)
+        if max_ticks != self._colunas.maxlen or len(historico.tarefas) != self._n_tarefas:
+            # Terminal mudou de tamanho ou entrou tarefa nova: redesenha a janela visível
+            self._colunas = deque(maxlen=max_ticks)
+            self._proxima = 0
+            self._n_tarefas = len(historico.tarefas)
+        # imprime apenas os últimos max_ticks ticks
+        inicio = max(self._proxima, len(historico) - max_ticks)
+        if inicio < len(historico):
+            tempos, sobrecargas = historico.colunas(inicio)
+            estados = historico.janela(inicio)
+            for c, (tempo, at_overload) in enumerate(zip(tempos, sobrecargas)):
+                self._colunas.append(self._desenhar_coluna(tempo, at_overload, [linha[c] for linha in estados]))
+        self._proxima = len(historico)
+        return self._colunas
+
+    def _desenhar_coluna(self, tempo, at_overload, this_time):
+        SLOT_LEN = 5
+        if at_overload:
+                SLOT_LEN = floor( self.overload_cost /self.time_slice * SLOT_LEN)
+                SLOT_LEN = max(SLOT_LEN, 4)
+        diff = SLOT_LEN + 1
+
+        time_str =  f'{tempo:1.1f}'.rjust(diff)
+        linhas = []
+        for t in this_time:
+            task_color = instantTypeToColor(t[0])
+            CHAR = " "
+            if t[1] == True:
+                CHAR = "X"
+            if t[0] == instantType.HALF_WAITING:
+                half = floor(SLOT_LEN / 2)
+                linhas.append(f"\033[{0}m{CHAR * half}\033[0m"  + f"\033[{task_color}m{CHAR * (SLOT_LEN - half)}\033[0m")
+            else:
+                linhas.append(f"\033[{task_color}m{CHAR * SLOT_LEN}\033[0m")
+            linhas.append("-" * SLOT_LEN)
+        return time_str, linhas
+
+    def quadro(self, historico, max_ticks, task_header, max_len):
+        """Cabeçalho e linhas do Gantt: nomes das tarefas, divisórias e as colunas visíveis."""
+        colunas = self.colunas(historico, max_ticks)
+        n = len(historico.tarefas)
+        # Divisória entre colunas: sublinhada na primeira linha e '-' na última
+        v_div = [console.uline("|")] + ["|"] * ((n - 1) * 2) + ["-"]
+        linhas = []
+        for i, t in enumerate(historico.tarefas):
+            nome = f"\033[1;37m{t.nome.rjust(max_len)}\033[0m "
+            # Centraliza como o mergeLines: o nome é um caractere mais curto que a linha de baixo
+            nome = " " + nome if len(nome) % 2 == 0 else nome + " "
+            linhas.append(nome)
+            linhas.append("-" * (max_len + 2))
+        for j in range(len(linhas)):
+            linhas[j] += v_div[j] + "".join(coluna[1][j] + v_div[j] for coluna in colunas)
+        task_header += "".join(coluna[0] for coluna in colunas)
+        return task_header, "\n".join(linhas)
+
+    def tabela(self, tarefas, n_finalizadas):
+        """Tabela de chegada, burst, prioridade e deadline das tarefas. Só muda
+        quando uma tarefa finaliza (o deadline ganha a cor de sucesso ou falha)."""
+        chave = (len(tarefas), n_finalizadas)
+        if self._tabela is not None and self._tabela[0] == chave:
+            return self._tabela[1]
+        headers = ["Cheg", "Burs", "Prio", "Dead"]
+        headers = [console.bold(h) for h in headers]
+        data = []
+        for t in tarefas:
+            deadline = t.deadline
+            if str(t.deadline) == "inf":
+                deadline = "---"
+            if t.estado == TaskState.FINALIZADO and deadline != "---":
+                if t.taskFailed:
+                    deadline = console.insert_color(deadline, "1;31")
+                else:
+                    deadline = console.insert_color(deadline, "1;32")
+            data.append([ t.chegada, t.duracao, t.prioridade, deadline])
+        table = tabulate.tabulate(
+            headers=headers,
+            tabular_data=data,
+            disable_numparse=True,
+            stralign="center",
+            tablefmt="fancy_grid",
+            )
+        self._tabela = (chave, table)
+        return table
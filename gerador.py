@@ -0,0 +1,177 @@
+import argparse
+import csv
+import json
+import random
+import sys
+from math import ceil, exp, floor, log
+
+from entrada import FORMATOS
+from task import TaskSpec
+
+# Formatos de saída: os mesmos que o main.py aceita em -f
+SAIDAS = (".json",) + FORMATOS
+CHEGADAS = ("poisson", "rajadas")
+# Distribuições de duração -> número de parâmetros
+DURACOES = {"uniforme": 2, "exponencial": 1, "fixa": 1}
+
+
+def ler_duracao(texto):
+    """Converte "uniforme:a:b", "exponencial:media" ou "fixa:v" em (tipo, parâmetros)."""
+    tipo, *parametros = texto.split(":")
+    n = DURACOES.get(tipo)
+    if n is None or len(parametros) != n:
+        raise ValueError(f"Distribuição de duração inválida: {texto} (use uniforme:a:b, exponencial:media ou fixa:v)")
+    parametros = [float(p) for p in parametros]
+    if tipo == "uniforme" and not 1 <= parametros[0] <= parametros[1]:
+        raise ValueError(f"Intervalo de duração inválido: {texto}")
+    if min(parametros) <= 0:
+        raise ValueError(f"Duração deve ser positiva: {texto}")
+    return tipo, parametros
+
+
+def ler_intervalo(texto, tipo=float):
+    """Converte "a:b" em (a, b)."""
+    a, b = (tipo(v) for v in texto.split(":"))
+    if a > b:
+        raise ValueError(f"Intervalo inválido: {texto}")
+    return a, b
+
+
+def duracao_media(tipo, parametros):
+    """Duração média das tarefas geradas (já arredondadas para inteiros)."""
+    if tipo == "uniforme":
+        a, b = ceil(parametros[0]), floor(parametros[1])
+        return (a + b) / 2
+    if tipo == "exponencial":
+        # Média de ceil(X) com X exponencial de média m
+        return 1 / (1 - exp(-1 / parametros[0]))
+    return max(1, round(parametros[0]))
+
+
+def gerar(n, seed=0, chegadas="poisson", utilizacao=0.7, nucleos=1, duracao=("uniforme", [1, 10]),
+          folga=(1.5, 3.0), sem_deadline=0.0, prioridade=(1, 10), rajada=8):
+    """Gera n TaskSpec em ordem de chegada, uma de cada vez (a memória não
+    depende de n). O mesmo seed gera sempre o mesmo workload.
+
+    As chegadas são um processo de Poisson, ou rajadas ("rajadas") de em média
+    `rajada` tarefas próximas separadas por pausas longas, com a taxa ajustada
+    para que a carga média seja `utilizacao` dos `nucleos` processadores. O
+    deadline é a duração vezes uma folga sorteada em `folga` (sem deadline com
+    probabilidade `sem_deadline`). Tempos são inteiros, como nos workloads
+    escritos à mão."""
+    if chegadas not in CHEGADAS:
+        raise ValueError(f"Chegadas devem ser um de {CHEGADAS}")
+    if utilizacao <= 0:
+        raise ValueError("A utilização deve ser positiva")
+    # Validado aqui, antes da primeira tarefa: os erros não deixam uma saída pela metade
+    return _tarefas(n, random.Random(seed), chegadas, utilizacao, nucleos, duracao, folga, sem_deadline, prioridade, rajada)
+
+
+def _tarefas(n, aleatorio, chegadas, utilizacao, nucleos, duracao, folga, sem_deadline, prioridade, rajada):
+    tipo, parametros = duracao
+    # Intervalo médio entre chegadas para a carga pedida
+    intervalo = duracao_media(tipo, parametros) / (utilizacao * nucleos)
+    # Rajadas: chegadas rápidas dentro da rajada e uma pausa que compensa,
+    # mantendo o mesmo intervalo médio por tarefa
+    intervalo_rajada = intervalo / rajada
+    pausa = rajada * intervalo - (rajada - 1) * intervalo_rajada
+    # Tarefas extras de cada rajada: geométrica de média rajada - 1
+    taxa_extras = log(rajada / (rajada - 1)) if rajada > 1 else None
+
+    tempo = 0.0
+    restantes_rajada = 0
+    for i in range(n):
+        if chegadas == "poisson":
+            tempo += aleatorio.expovariate(1 / intervalo)
+        elif restantes_rajada > 0:
+            restantes_rajada -= 1
+            tempo += aleatorio.expovariate(1 / intervalo_rajada)
+        else:
+            restantes_rajada = floor(aleatorio.expovariate(taxa_extras)) if taxa_extras else 0
+            tempo += aleatorio.expovariate(1 / pausa)
+
+        if tipo == "uniforme":
+            d = aleatorio.randint(ceil(parametros[0]), floor(parametros[1]))
+        elif tipo == "exponencial":
+            d = max(1, ceil(aleatorio.expovariate(1 / parametros[0])))
+        else:
+            d = max(1, round(parametros[0]))
+        deadline = None
+        if aleatorio.random() >= sem_deadline:
+            deadline = ceil(d * aleatorio.uniform(*folga))
+        yield TaskSpec(f"T{i}", floor(tempo), d, deadline, aleatorio.randint(*prioridade))
+
+
+def _como_dict(spec):
+    tarefa = {"nome": spec.nome, "chegada": spec.chegada, "duracao": spec.duracao,
+              "deadline": spec.deadline, "prioridade": spec.prioridade}
+    if spec.deadline is None:
+        del tarefa["deadline"]
+    return tarefa
+
+
+def escrever(specs, saida, formato=".jsonl"):
+    """Escreve as tarefas em saida à medida que são geradas, num dos formatos
+    que o main.py lê: .json (objeto com "tasks"), .jsonl ou .csv."""
+    if formato == ".csv":
+        escritor = csv.writer(saida)
+        escritor.writerow(("nome", "chegada", "duracao", "deadline", "prioridade"))
+        for s in specs:
+            escritor.writerow((s.nome, s.chegada, s.duracao, "" if s.deadline is None else s.deadline, s.prioridade))
+    elif formato == ".jsonl":
+        for s in specs:
+            saida.write(json.dumps(_como_dict(s)) + "\n")
+    elif formato == ".json":
+        saida.write('{"tasks": [')
+        separador = "\n"
+        for s in specs:
+            saida.write(separador + json.dumps(_como_dict(s)))
+            separador = ",\n"
+        saida.write("\n]}\n")
+    else:
+        raise ValueError(f"Formato de saída deve ser um de {SAIDAS}")
+
+
+def main(argv=None):
+    """Linha de comando do gerador (python main.py gerar ... ou python gerador.py ...)."""
+    parser = argparse.ArgumentParser(prog="main.py gerar", description="Gera um workload sintético reprodutível",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000, help="número de tarefas")
+    parser.add_argument("--seed", type=int, default=0, help="semente: o mesmo seed gera o mesmo workload")
+    parser.add_argument("--chegadas", choices=CHEGADAS, default="poisson",
+                        help="processo de chegada: Poisson ou rajadas de tarefas próximas")
+    parser.add_argument("--rajada", type=float, default=8, help="tamanho médio das rajadas (--chegadas rajadas)")
+    parser.add_argument("-u", "--utilizacao", type=float, default=0.7,
+                        help="carga média pedida aos processadores (1 = ocupados o tempo todo)")
+    parser.add_argument("--nucleos", type=int, default=1, help="número de processadores para o cálculo da carga")
+    parser.add_argument("--duracao", type=str, default="uniforme:1:10",
+                        help="distribuição da duração: uniforme:a:b, exponencial:media ou fixa:v")
+    parser.add_argument("--folga", type=str, default="1.5:3",
+                        help="deadline = duração * folga, com a folga sorteada no intervalo a:b")
+    parser.add_argument("--sem-deadline", type=float, default=0.0,
+                        help="fração das tarefas sem deadline")
+    parser.add_argument("--prioridade", type=str, default="1:10", help="intervalo das prioridades, a:b")
+    parser.add_argument("-o", "--output", type=str, default="",
+                        help=f"arquivo de saída, no formato da extensão ({', '.join(SAIDAS)}); padrão: jsonl no terminal")
+    args = parser.parse_args(argv)
+    if args.n < 0 or args.rajada < 1 or args.nucleos < 1 or not 0 <= args.sem_deadline <= 1:
+        parser.error("-n não pode ser negativo, --rajada e --nucleos devem ser >= 1 e --sem-deadline deve estar entre 0 e 1")
+    try:
+        specs = gerar(args.n, seed=args.seed, chegadas=args.chegadas, utilizacao=args.utilizacao,
+                      nucleos=args.nucleos, duracao=ler_duracao(args.duracao), folga=ler_intervalo(args.folga),
+                      sem_deadline=args.sem_deadline, prioridade=ler_intervalo(args.prioridade, int),
+                      rajada=args.rajada)
+        if not args.output:
+            escrever(specs, sys.stdout)
+            return
+        formato = next((f for f in SAIDAS if args.output.lower().endswith(f)), None)
+        if formato is None:
+            parser.error(f"Arquivo de saída deve terminar em {', '.join(SAIDAS)}")
+        with open(args.output, "w", newline="") as f:
+            escrever(specs, f, formato)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+
+if __name__ == "__main__":
+    main()
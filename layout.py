@@ -0,0 +1,66 @@
+import os
+import re
+import shutil
+import signal
+import threading
+from functools import lru_cache
+
+# Sequência de escape ANSI: do ESC até o 'm' (ou até o fim do texto, se não fechar)
+_ANSI = re.compile(r'\x1b[^m]*(?:m|$)')
+
+_tamanho = None  # Tamanho do terminal em cache, invalidado pelo SIGWINCH
+_sigwinch_instalado = False  # Se o cache pode confiar no SIGWINCH
+
+
+@lru_cache(maxsize=4096)
+def largura(texto):
+    """Número de caracteres visíveis do texto (ignora as sequências ANSI).
+    Memoizado: as mesmas linhas são medidas a cada quadro."""
+    if '\x1b' not in texto:
+        return len(texto)
+    return len(_ANSI.sub('', texto))
+
+
+def largura_maxima(linhas):
+    return max((largura(linha) for linha in linhas), default=0)
+
+
+def centralizar(linha, width, char=' '):
+    """Centraliza uma linha em width colunas visíveis. Reproduz o preenchimento
+    alternado do hcenter original (começa pela esquerda se o tamanho bruto da
+    linha for par, pela direita se for ímpar), mas calculado de uma vez."""
+    falta = width - largura(linha)
+    if falta <= 0:
+        return linha
+    metade = (falta + 1) // 2
+    if len(linha) % 2 == 0:
+        return char * metade + linha + char * (falta - metade)
+    return char * (falta - metade) + linha + char * metade
+
+
+def tamanho_terminal():
+    """Tamanho do terminal, consultado ao sistema só na primeira chamada e
+    depois de cada redimensionamento (SIGWINCH). Sem SIGWINCH (Windows, ou
+    importado fora da thread principal) consulta a cada chamada."""
+    global _tamanho
+    if _tamanho is not None:
+        return _tamanho
+    try:
+        tamanho = os.get_terminal_size()
+    except OSError:
+        # Saída redirecionada: usa $COLUMNS/$LINES ou 80x24
+        tamanho = shutil.get_terminal_size()
+    if _sigwinch_instalado:
+        _tamanho = tamanho
+    return tamanho
+
+
+def _redimensionado(signum, frame):
+    global _tamanho
+    _tamanho = None
+
+
+# Sinais só podem ser tratados na thread principal
+if hasattr(signal, "SIGWINCH") and threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGWINCH, _redimensionado)
+    _sigwinch_instalado = True
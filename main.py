@@ -1,20 +1,26 @@
-import copy
+from concurrent.futures import ProcessPoolExecutor
 import algoritimos
 from cav import CAV
-from task import TarefaCAV
+from entrada import FORMATOS, carregar_json, compilar, fluxo_invalido, fluxo_tarefas
+from task import TaskSpec, tabela_tarefas
 import argparse
 import os
 import json
 import console
+import sys
+import varredura
+import gerador
 from escalonador import escalonador as Escalonador
+from perfil import perfilador
+from memoria import medidor_memoria
 
 # Caso o arquivo de entrada não seja especificado, utiliza os valores padrão:
 
 # Algoritmos, Preemptabilidade
 # Cada tupla contém o algoritmo e suas opções
 ALGORITMOS = [
-    (algoritimos.escalonador_edf, {"preemptive": True, "quantum": 2}),
-    (algoritimos.escalonador_lottery, {"preemptive": True,  "quantum": 2}),
+    (algoritimos.escalonador_edf, {"preemptive": True}),
+    (algoritimos.escalonador_lottery, {"preemptive": True}),
     (algoritimos.escalonador_rr, {"preemptive": True, "quantum": 2}),
     (algoritimos.escalonador_priority, {"preemptive": True}),
     (algoritimos.escalonador_fcfs, {"preemptive": True}),
@@ -23,23 +29,98 @@ ALGORITMOS = [
 
 # Lista de tarefas iniciais
 START_TASKS = [
-    TarefaCAV("Processo1", chegada=0, duracao=5, prioridade=1, ),
-    TarefaCAV("Processo2", chegada=1, duracao=3, prioridade=2, deadline=8),
-    TarefaCAV("Processo3", chegada=2, duracao=2, prioridade=1, deadline=5),
-    TarefaCAV("Processo4", chegada=3, duracao=4, prioridade=3, deadline=12),
-    TarefaCAV("Processo5", chegada=4, duracao=1, prioridade=2, deadline=6)
+    TaskSpec("Processo1", chegada=0, duracao=5, prioridade=1, ),
+    TaskSpec("Processo2", chegada=1, duracao=3, prioridade=2, deadline=8),
+    TaskSpec("Processo3", chegada=2, duracao=2, prioridade=1, deadline=5),
+    TaskSpec("Processo4", chegada=3, duracao=4, prioridade=3, deadline=12),
+    TaskSpec("Processo5", chegada=4, duracao=1, prioridade=2, deadline=6)
 ]
 # Estes valores podem ser ajustados via linha de comando
 OVERLOAD_COST = 0.6  # Tempo de sobrecarga
 TIME_SLICE = 1 # Tempo entre cada tick do escalonador
 
 
+def formatar_resultado(resultado, tempos_decisao=False):
+    """Formata os números de escalonador.resultado() para exibição. As latências
+    das decisões (tempo de parede, mudam a cada execução) só entram com
+    tempos_decisao, para a saída padrão ser a mesma em execuções iguais."""
+    res = {}
+    for k, v in resultado.items():
+        if k == "failed_names" or ("decisao_us" in k and not tempos_decisao):
+            continue
+        if k == "failed_processes" and v > 0:
+            nomes = resultado["failed_names"]
+            # Só os primeiros nomes são guardados; o resto aparece como contagem
+            omitidos = f" ... +{v - len(nomes)}" if v > len(nomes) else ""
+            v = f"{v} ({','.join(nomes)}{omitidos})"
+        elif isinstance(v, float):
+            v = f"{v:.2f}"
+        elif isinstance(v, list):
+            v = ", ".join(f"{x:.2f}" for x in v)
+        elif isinstance(v, dict):
+            # Faixas de fila -> n, média e percentis de cada faixa
+            v = "; ".join(f"{chave}: " + " ".join(f"{m} {x}" if isinstance(x, int) else f"{m} {x:.2f}"
+                                                  for m, x in faixa.items())
+                          for chave, faixa in v.items())
+        res[k] = v
+    return res
+
+
+def simular_algoritmo(cav_id, alg, opts, tarefas, args):
+    """Simula um algoritmo sobre as tarefas dadas num novo CAV e retorna
+    (nome, preemptivo, id do CAV, resultados, relatórios do --perfil/--memoria). Roda tanto no processo
+    principal quanto num worker do --jobs. A tabela de tarefas só é lida: o
+    estado de execução é criado pelo CAV para esta simulação."""
+    # Cria uma nova instância de CAV para cada algoritmo
+    if opts is None:
+        algoritimo = alg()
+    else:
+        algoritimo = alg(**opts)
+    memoria = None
+    if args.memoria is not None:
+        # Começa antes do CAV, para as tarefas entrarem na conta
+        memoria = medidor_memoria(args.memoria)
+        memoria.iniciar()
+    # Cria uma nova instância de CAV com o escalonador
+    cav = CAV(cav_id, escalonador=Escalonador(algoritimo, time_slice=args.time_slice, sobrecarga=args.overload_cost, headless=args.headless, motor=args.motor, nucleos=args.nucleos, custo_decisao=args.custo_decisao))
+    if isinstance(tarefas, fluxo_tarefas):
+        cav.adicionar_fluxo(tarefas)
+    else:
+        cav.adicionar_tabela(tarefas)
+    perfil = None
+    if args.perfil is not None:
+        # Mede as fases só deste escalonador
+        perfil = perfilador()
+        perfil.instrumentar(cav.escalonador)
+    if memoria is not None:
+        memoria.instrumentar(cav.escalonador)
+    # Inicia a simulação do CAV
+    cav.simular(args.t, headless=args.headless, fps=args.fps)
+    relatorios = []
+    if memoria is not None:
+        memoria.parar()
+        relatorios.append(("Memória", memoria.relatorio()))
+    if perfil is not None:
+        relatorios.append(("Perfil", perfil.relatorio()))
+        if args.perfil:
+            # Pilhas colapsadas de todos os algoritmos no mesmo arquivo, com o algoritmo na raiz
+            with open(args.perfil, "a") as f:
+                f.write("".join(linha + "\n" for linha in perfil.pilhas_colapsadas(algoritimo.name)))
+    return algoritimo.name, algoritimo.preemptive, cav.id, cav.get_statistics(), relatorios
+
+
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["gerar"]:
+        # Subcomando: python main.py gerar ... (ver gerador.py)
+        gerador.main(sys.argv[2:])
+        quit()
     # Argumentos de linha de comando
     parser = argparse.ArgumentParser(description="Simulador de Escalonamento de Processos",
                                      formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    parser.add_argument("-t", type=float, default=0.5,
-                        help="tempo de sleep entre ticks (padrão: 0.5) numeros negativos não são permitidos, 0 desativa o sleep"),
+    parser.add_argument("-t", type=float, default=2,
+                        help="velocidade da simulação, em unidades de tempo simuladas por segundo. Números negativos não são permitidos, 0 simula sem limite de velocidade"),
+    parser.add_argument("--fps", type=float, default=20,
+                        help="quadros por segundo do desenho no terminal")
     parser.add_argument("-f", "--file", type=str, default="",
                         help="caminho para o arquivo de entrada")
     parser.add_argument("-o", "--output", type=str, default="",
@@ -50,10 +131,42 @@ if __name__ == "__main__":
                         help=f"tempo de slice do escalonador (padrão: {TIME_SLICE})")
     parser.add_argument("-m", "--manual", action='store_true',
                         help="pede input ao usuario a cada algoritmo utilizado.")
+    parser.add_argument("--headless", action='store_true',
+                        help="simula sem renderizar no terminal, apenas imprime os resultados finais")
+    parser.add_argument("--motor", type=str, default="tick", choices=["tick", "eventos"],
+                        help="motor de simulação: 'tick' avança um time slice por vez, 'eventos' salta entre chegadas, conclusões e preempções")
+    parser.add_argument("-n", "--nucleos", type=int, default=1,
+                        help="número de processadores do CAV (default: 1)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="número de processos para simular os algoritmos em paralelo (implica --headless)")
+    parser.add_argument("--sweep-ts", type=str, default=None,
+                        help="varredura: valores de time slice, 'a:b:passo' ou 'v1,v2,...'")
+    parser.add_argument("--sweep-c", type=str, default=None,
+                        help="varredura: valores de custo de sobrecarga, 'a:b:passo' ou 'v1,v2,...'")
+    parser.add_argument("--sweep-quantum", type=str, default=None,
+                        help="varredura: valores de quantum, 'a:b:passo' ou 'v1,v2,...' ('none' = padrão do algoritmo)")
+    parser.add_argument("--sweep-preemptive", type=str, default=None,
+                        help="varredura: valores de preemptive, ex.: 'true,false'")
+    parser.add_argument("--custo-decisao", type=float, default=0, metavar="ESCALA",
+                        help="soma à sobrecarga de cada troca de contexto o custo real (medido) da decisão do algoritmo, em t.u. por µs; 0 = só mede e reporta")
+    parser.add_argument("--perfil", nargs="?", const="", default=None, metavar="ARQUIVO",
+                        help="mede o tempo de cada fase da simulação e mostra um relatório no fim; com ARQUIVO, grava também as pilhas colapsadas (flame graph)")
+    parser.add_argument("--memoria", nargs="?", type=float, const=0, default=None, metavar="ORCAMENTO_MB",
+                        help="relatório de memória (tracemalloc) por subsistema, com bytes por tarefa e por tick; com ORCAMENTO_MB, avisa se a memória projetada para o fim da simulação passar do orçamento")
+    parser.add_argument("--compilar", action='store_true',
+                        help="valida as tasks do arquivo -f (.json) e grava a forma binária usada nas próximas leituras, depois sai")
     args = parser.parse_args()
+    if args.t < 0 or args.fps <= 0 or args.custo_decisao < 0:
+        parser.error("-t e --custo-decisao não podem ser negativos e --fps deve ser positivo")
+    if args.compilar and not args.file.strip().endswith(".json"):
+        parser.error("--compilar precisa de um arquivo .json em -f")
+    if args.jobs > 1:
+        # Os workers não compartilham o terminal: simulam sem renderizar
+        args.headless = True
 
 
     data = [] # Lista para armazenar os dados; resultados das simulações
+    sweep = {} # Dimensões da varredura (bloco "sweep" do json e/ou --sweep-*)
     
     if args.file:
         args.file = args.file.strip()
@@ -61,20 +174,31 @@ if __name__ == "__main__":
         if not os.path.isfile(args.file):
             print(f"Arquivo '{args.file}' não encontrado.")
             quit()
-        if not args.file.endswith(".json"):
-            print("Arquivo deve ser .json")
+        if args.file.lower().endswith(FORMATOS):
+            # Fluxo de tarefas: lido aos poucos durante cada simulação
+            try:
+                START_TASKS = fluxo_tarefas(args.file)
+            except fluxo_invalido as erro:
+                print(f"Erro ao ler o arquivo de tarefas: {erro}")
+                quit()
+        elif not args.file.endswith(".json"):
+            print(f"Arquivo deve ser .json ou {'/'.join(FORMATOS)}")
             quit()
-        # Read tasks from file
-        with open(args.file, "r") as f:
+        else:
+            if args.compilar:
+                try:
+                    print(f"Workload compilado em {compilar(args.file)}")
+                except (json.JSONDecodeError, ValueError) as erro:
+                    print(f"Erro ao compilar {args.file}: {erro}")
+                quit()
+            # Read tasks from file (da forma compilada, se estiver em dia com o json)
             try:
-                file = json.load(f)
+                file, tabela = carregar_json(args.file)
             except json.JSONDecodeError:
                 print(f"Erro ao ler o arquivo JSON: {args.file}")
                 quit()
-            if "tasks" in file:
-                START_TASKS = []
-                for t in file["tasks"]:
-                    START_TASKS.append(TarefaCAV(**t))
+            if tabela is not None:
+                START_TASKS = tabela
             if "algoritmos" in file:
                 ALGORITMOS = []
                 for a in file["algoritmos"]:
@@ -82,34 +206,67 @@ if __name__ == "__main__":
                     if "options" in a:
                         options = a["options"]
                     ALGORITMOS.append((getattr(algoritimos, "escalonador_" + a["name"]), options))
-             
+            if "sweep" in file:
+                sweep.update(file["sweep"])
+
+    if not isinstance(START_TASKS, (tabela_tarefas, fluxo_tarefas)):
+        START_TASKS = tabela_tarefas.de_specs(START_TASKS)
+
+    try:
+        for chave, texto, tipo in (("time_slice", args.sweep_ts, float), ("sobrecarga", args.sweep_c, float),
+                                   ("quantum", args.sweep_quantum, float), ("preemptive", args.sweep_preemptive, bool)):
+            if texto is not None:
+                sweep[chave] = varredura.ler_valores(texto, tipo)
+        grade = varredura.montar_grade(sweep, args.time_slice, args.overload_cost) if sweep else None
+    except ValueError as erro:
+        parser.error(str(erro))
+    if sweep:
+        # Modo varredura: uma linha CSV por (algoritmo, ponto da grade), escrita assim que o ponto termina
+        try:
+            linhas = varredura.varrer(ALGORITMOS, START_TASKS, grade, jobs=args.jobs, motor=args.motor, nucleos=args.nucleos)
+            if args.output:
+                with open(args.output, "w", newline="") as f:
+                    varredura.escrever_csv(linhas, f, nucleos=args.nucleos)
+            else:
+                varredura.escrever_csv(linhas, sys.stdout, nucleos=args.nucleos)
+        except fluxo_invalido as erro:
+            # Uma linha inválida mais adiante no fluxo só aparece durante a simulação
+            print(f"Erro ao ler o arquivo de tarefas: {erro}", file=sys.stderr)
+        quit()
 
     # Desabilita o cursor do console para uma melhor visualização
-    console.show_cursor(False)
+    if not args.headless:
+        console.show_cursor(False)
     
-    cav_id = 0
-    # Simula cada algoritmo com as tarefas criadas
-    for alg, opts in ALGORITMOS:
-        # Cria uma nova instância de CAV para cada algoritmo
-        if opts is None:
-            algoritimo = alg()
+    if args.perfil:
+        # As pilhas de cada algoritmo são acrescentadas ao arquivo
+        open(args.perfil, "w").close()
+
+    try:
+        if args.jobs > 1:
+            # Cada algoritmo roda em um processo separado, sem renderização.
+            # Os resultados são coletados na ordem original de ALGORITMOS
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                futuros = [pool.submit(simular_algoritmo, cav_id, alg, opts, START_TASKS, args)
+                           for cav_id, (alg, opts) in enumerate(ALGORITMOS)]
+                try:
+                    data = [futuro.result() for futuro in futuros]
+                except fluxo_invalido:
+                    pool.shutdown(cancel_futures=True)
+                    raise
         else:
-            algoritimo = alg(**opts)
-        # Cria uma nova instância de CAV com o escalonador
-        cav = CAV(cav_id, escalonador=Escalonador(algoritimo, time_slice=args.time_slice, sobrecarga=args.overload_cost))
-        cav_id += 1 # Incrementa o ID do CAV para cada iteração
-        
-        for _task in copy.deepcopy(START_TASKS): #cria novas instâncias das tasks iniciais
-            cav.adicionar_tarefa(_task)
-        # Inicia a simulação do CAV
-        cav.simular(args.t)
-        result = cav.get_statistics()
-        data.append((algoritimo.name, algoritimo.preemptive, cav.id, result))
-        if args.manual:
-            input(f"\033[93;1mPressione Enter para continuar com o próximo algoritmo...\033[0m")
-
-        # simulator.start_sync()
-        # simulator.print_snapshot()
+            # Simula cada algoritmo com as tarefas criadas
+            for cav_id, (alg, opts) in enumerate(ALGORITMOS):
+                data.append(simular_algoritmo(cav_id, alg, opts, START_TASKS, args))
+                if args.manual:
+                    input(f"\033[93;1mPressione Enter para continuar com o próximo algoritmo...\033[0m")
+    except fluxo_invalido as erro:
+        # Uma linha inválida mais adiante no fluxo só aparece durante a simulação
+        if not args.headless:
+            console.show_cursor(True)
+        print(f"\nErro ao ler o arquivo de tarefas: {erro}")
+        quit()
+
     if args.output:
         print(f"\033[92;1mSalvando resultados em \033[4m{args.output}\033[0m")
         if not os.path.exists(args.output):
@@ -120,15 +277,20 @@ if __name__ == "__main__":
             with open(args.output, "w") as f:
                 f.write("")
   
+    # Latências das decisões só com --perfil ou --custo-decisao (dependem da máquina)
+    tempos_decisao = args.perfil is not None or args.custo_decisao > 0
     for _data in data:
         # console.home()
         str = f"Cav #{_data[2]} Algoritmo: {_data[0]}, Preemptável: {_data[1]} \n"
 
-        str += "\n\t".join(f"{k}: {v}" for k, v in _data[3].items())
+        str += "\n\t".join(f"{k}: {v}" for k, v in formatar_resultado(_data[3], tempos_decisao).items())
         if args.output:
             print(f"\033[92;1mSalvando resultados em \033[4m{args.output}\033[0m")
             with open(args.output, "a") as f:
                 f.write(str + "\n")
         print(str)
+        for titulo, relatorio in _data[4]:
+            print(f"{titulo} ({_data[0]}):\n{relatorio}\n")
 
-    console.show_cursor(True)
\ No newline at end of file
+    if not args.headless:
+        console.show_cursor(True)
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+import sys
+import tracemalloc
+
+import tabulate
+
+# Subsistema de cada arquivo: uma alocação conta para o primeiro arquivo do
+# simulador na pilha de quem alocou (do mais interno para o mais externo)
+SUBSISTEMAS = {
+    "task.py": "tarefas",
+    "cav.py": "tarefas",
+    "entrada.py": "tarefas",
+    "snapshot.py": "histórico",
+    "algoritimos.py": "algoritmo",
+    "estruturas.py": "algoritmo",
+    "gantt.py": "desenho",
+    "tela.py": "desenho",
+    "layout.py": "desenho",
+    "console.py": "desenho",
+    "tabulate": "desenho",
+    "metricas.py": "métricas",
+    "escalonador.py": "escalonador",
+}
+# Profundidade das pilhas guardadas pelo tracemalloc. Cada quadro a mais
+# encarece toda alocação; 4 bastam para chegar a um arquivo do simulador
+_QUADROS = 4
+
+
+def _subsistema(traceback):
+    """Subsistema de uma pilha de alocação, ou None para o que o próprio
+    medidor alocou (tracemalloc e as amostras)."""
+    if os.path.basename(traceback[-1].filename) in ("tracemalloc.py", "memoria.py"):
+        return None
+    # O traceback vai do quadro mais externo para o mais interno
+    for quadro in reversed(traceback):
+        nome = os.path.basename(quadro.filename)
+        if nome in SUBSISTEMAS:
+            return SUBSISTEMAS[nome]
+        if "tabulate" in quadro.filename:
+            return SUBSISTEMAS["tabulate"]
+    return "outros"
+
+
+class medidor_memoria:
+    """Relatório de memória opcional, com tracemalloc. instrumentar() troca o
+    tick do escalonador (só naquela instância) por um que, nos ticks 1, 2, 4,
+    8, ..., tira uma amostra das alocações vivas, separadas por subsistema
+    (tarefas, histórico, estado do algoritmo, desenho, métricas). Amostras em
+    potências de 2 custam O(log ticks) snapshots numa simulação de qualquer
+    tamanho.
+
+    Com um orçamento (MB), cada amostra projeta a memória no fim da simulação
+    pelo crescimento desde a amostra anterior em relação à fração de tarefas
+    finalizadas no intervalo e avisa se a projeção passar do
+    orçamento. A projeção precisa do total de tarefas, então não existe
+    enquanto um fluxo (.jsonl/.csv) não terminou de ser lido."""
+
+    def __init__(self, orcamento_mb=0):
+        self.orcamento = orcamento_mb * 2 ** 20
+        self.amostras = []  # (tick, tarefas em memória, bytes por subsistema)
+        self.avisos = []
+        self.ticks = 0
+        self._proxima = 1  # Tick da próxima amostra
+        self._inicial = 0  # Memória rastreada antes da simulação
+        self._anterior = None  # (fração finalizada, memória) da amostra anterior
+        self._classificadas = {}  # traceback -> subsistema, de uma amostra para a outra
+
+    def iniciar(self):
+        """Começa a rastrear as alocações. Chamado antes de criar as tarefas,
+        para que elas entrem na conta."""
+        tracemalloc.start(_QUADROS)
+        self._inicial = tracemalloc.get_traced_memory()[0]
+
+    def instrumentar(self, escalonador):
+        self._escalonador = escalonador
+        for metodo in ("tick", "tick_evento"):
+            setattr(escalonador, metodo, self._medir(getattr(escalonador, metodo)))
+        return escalonador
+
+    def _medir(self, funcao):
+        def medida(*args, **kwargs):
+            resultado = funcao(*args, **kwargs)
+            self.ticks += 1
+            if self.ticks == self._proxima:
+                self._proxima *= 2
+                self.amostrar()
+            return resultado
+        return medida
+
+    def amostrar(self):
+        e = self._escalonador
+        por_subsistema = {}
+        # Agrupadas por pilha, cada pilha distinta é classificada uma vez só
+        for estatistica in tracemalloc.take_snapshot().statistics("traceback"):
+            tb = estatistica.traceback
+            if tb not in self._classificadas:
+                self._classificadas[tb] = _subsistema(tb)
+            nome = self._classificadas[tb]
+            if nome is not None:
+                por_subsistema[nome] = por_subsistema.get(nome, 0) + estatistica.size
+        # Tarefas em memória: todas ou, quando um fluxo descarta as finalizadas, as
+        # que ainda estão na lista de chegadas (até ela ser compactada) e as prontas
+        vivas = len(e.tarefas) or len(e._por_chegada) + len(e.prontas)
+        self.amostras.append((self.ticks, vivas, por_subsistema))
+        self._projetar(sum(por_subsistema.values()))
+
+    def _projetar(self, atual):
+        e = self._escalonador
+        if not self.orcamento or e._fonte is not None or not e.n_tarefas:
+            return
+        feito = e.n_finalizadas / e.n_tarefas
+        # Extrapola o crescimento desde a amostra anterior, não desde o início:
+        # o que é alocado uma vez só (tabelas, histogramas) não cresce com as tarefas
+        anterior_feito, anterior = self._anterior or (0, self._inicial)
+        self._anterior = feito, atual
+        if feito < 0.05 or feito <= anterior_feito:
+            return  # Cedo demais para extrapolar, ou nada finalizado desde a amostra anterior
+        projetada = atual + (atual - anterior) / (feito - anterior_feito) * (1 - feito)
+        if projetada > self.orcamento and not self.avisos:
+            aviso = (f"memória projetada para o fim da simulação: {projetada / 2 ** 20:.2f} MB, "
+                     f"acima do orçamento de {self.orcamento / 2 ** 20:.2f} MB "
+                     f"(tick {self.ticks}, {feito:.0%} das tarefas finalizadas)")
+            self.avisos.append(aviso)
+            if e.headless:
+                print(f"Aviso: {aviso}", file=sys.stderr)
+
+    def parar(self):
+        """Tira a amostra final e para o tracemalloc. Retorna o pico (bytes)."""
+        self.amostrar()
+        self.pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return self.pico
+
+    def relatorio(self):
+        """Pico, memória por subsistema (final e máxima), bytes por tarefa e por tick e os avisos."""
+        nomes = sorted({nome for _, _, subs in self.amostras for nome in subs})
+        final = self.amostras[-1][2]
+        linhas = [[nome, f"{final.get(nome, 0) / 1024:.1f}",
+                   f"{max(subs.get(nome, 0) for _, _, subs in self.amostras) / 1024:.1f}"] for nome in nomes]
+        texto = tabulate.tabulate(linhas, headers=["subsistema", "final (KB)", "máximo (KB)"])
+        # Bytes por tarefa na amostra com mais tarefas em memória (com um fluxo, as
+        # finalizadas são descartadas), onde o custo fixo da leitura pesa menos
+        _, vivas, subs = max(self.amostras, key=lambda amostra: amostra[1])
+        por_tarefa = subs.get("tarefas", 0) / vivas if vivas else 0
+        ticks = self.amostras[-1][0]
+        historico = final.get("histórico", 0)
+        total = sum(final.values()) - self._inicial
+        texto += f"\npico: {self.pico / 2 ** 20:.2f} MB"
+        texto += f"\nbytes por tarefa: {por_tarefa:.0f}"
+        if ticks:
+            texto += f"\nbytes por tick: {total / ticks:.0f} (histórico: {historico / ticks:.0f})"
+        for aviso in self.avisos:
+            texto += f"\nAVISO: {aviso}"
+        return texto
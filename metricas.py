@@ -0,0 +1,147 @@
+from array import array
+import heapq
+from math import ceil
+
+# Percentis reportados em resultado()
+PERCENTIS = (50, 95, 99)
+# Nomes de tarefas que falharam guardados para resultado() (a contagem é sempre exata)
+MAX_NOMES_FALHAS = 20
+
+
+class histograma:
+    """Histograma log-linear de memória limitada (no estilo do HdrHistogram).
+    Os valores são medidos em unidades de `resolucao`; até 2**bits unidades cada
+    unidade tem o seu balde (valor exato), e acima disso cada potência de 2 é
+    dividida em 2**(bits-1) baldes, então o erro relativo fica abaixo de
+    2**-(bits-1). Registrar custa O(1) e calcular um percentil percorre só os
+    baldes, nunca os valores. Média, mínimo e máximo são exatos."""
+
+    def __init__(self, resolucao=0.01, bits=11):
+        self.resolucao = resolucao
+        self._bits = bits
+        self._exatos = 1 << bits  # Baldes de largura 1 unidade
+        self._meio = 1 << (bits - 1)  # Baldes por potência de 2 acima dos exatos
+        self.contagens = array('q')  # Cresce só até o balde do maior valor visto
+        self.n = 0
+        self.soma = 0
+        self.minimo = float('inf')
+        self.maximo = float('-inf')
+
+    def registrar(self, valor):
+        self.n += 1
+        self.soma += valor
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        i = self._indice(max(0, round(valor / self.resolucao)))
+        if i >= len(self.contagens):
+            self.contagens.extend(array('q', bytes(8 * (i + 1 - len(self.contagens)))))
+        self.contagens[i] += 1
+
+    def media(self):
+        return self.soma / self.n if self.n else 0.0
+
+    def percentil(self, p):
+        """Menor valor v tal que pelo menos p% dos valores registrados são <= v
+        (dentro da precisão do balde). 0.0 se o histograma estiver vazio."""
+        if not self.n:
+            return 0.0
+        alvo = max(1, ceil(p / 100 * self.n))
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                valor = self._valor(i) * self.resolucao
+                return float(min(max(valor, self.minimo), self.maximo))
+        return float(self.maximo)
+
+    def _indice(self, x):
+        if x < self._exatos:
+            return x
+        deslocamento = x.bit_length() - self._bits
+        return self._exatos + (deslocamento - 1) * self._meio + (x >> deslocamento) - self._meio
+
+    def _valor(self, i):
+        # Menor valor (em unidades) que cai no balde i
+        if i < self._exatos:
+            return i
+        deslocamento, resto = divmod(i - self._exatos, self._meio)
+        return (resto + self._meio) << (deslocamento + 1)
+
+
+class acumulador_metricas:
+    """Métricas da simulação atualizadas em O(1) a cada evento de uma tarefa
+    (primeira execução, conclusão, estouro de deadline), sem varrer a lista
+    de tarefas."""
+
+    def __init__(self):
+        self.resposta = histograma()  # Tempo de resposta (1ra execução)
+        self.espera = histograma()  # Tempo de espera
+        self.retorno = histograma()  # Tempo de retorno (turnaround)
+        self.falhas = 0
+        # (-posição na lista de tarefas, nome) das primeiras MAX_NOMES_FALHAS tarefas
+        # que falharam, num heap de máximo: com um fluxo a lista não cresce sem limite
+        self._falhas = []
+
+    def inicio(self, tarefa):
+        self.resposta.registrar(tarefa.response_time)
+
+    def fim(self, tarefa):
+        self.retorno.registrar(tarefa.turn_around_time)
+        self.espera.registrar(tarefa.wait_time)
+
+    def falha(self, tarefa, ordem):
+        self.falhas += 1
+        if len(self._falhas) < MAX_NOMES_FALHAS:
+            heapq.heappush(self._falhas, (-ordem, tarefa.nome))
+        elif ordem < -self._falhas[0][0]:
+            heapq.heapreplace(self._falhas, (-ordem, tarefa.nome))
+
+    def nomes_falhas(self):
+        """Nomes das primeiras MAX_NOMES_FALHAS tarefas que falharam, na ordem da lista de tarefas."""
+        return [nome for _, nome in sorted(self._falhas, reverse=True)]
+
+    def resumo(self, n_tarefas):
+        """Médias e percentis de retorno, espera e resposta. As médias dividem
+        pelo número total de tarefas, como o simulador sempre reportou."""
+        res = {}
+        metricas = (("turnaround_time", self.retorno), ("wait_time", self.espera), ("response_time", self.resposta))
+        for nome, h in metricas:
+            res[f"avg_{nome}"] = h.soma / n_tarefas if n_tarefas else 0.0
+        for nome, h in metricas:
+            for p in PERCENTIS:
+                res[f"p{p}_{nome}"] = h.percentil(p)
+        return res
+
+
+class custo_decisoes:
+    """Tempo de parede (µs) de cada decisão do algoritmo de escalonamento,
+    num histograma geral e em um histograma por tamanho da fila de prontos na
+    hora da decisão (faixas de potências de 2), para ver como a média e a
+    cauda do custo da política crescem com o número de tarefas."""
+
+    def __init__(self):
+        self.tempos = histograma()
+        self._por_fila = {}  # bit_length do tamanho da fila -> histograma dos tempos
+
+    def registrar(self, micros, fila):
+        self.tempos.registrar(micros)
+        h = self._por_fila.get(fila.bit_length())
+        if h is None:
+            # Resolução de 0.1 µs: são várias faixas, cada uma com seus baldes
+            h = self._por_fila[fila.bit_length()] = histograma(resolucao=0.1)
+        h.registrar(micros)
+
+    def resumo(self):
+        """Número de decisões, média e percentis do custo, no geral e por faixa de fila."""
+        h = self.tempos
+        res = {"n_decisoes": h.n, "avg_decisao_us": h.media()}
+        for p in PERCENTIS:
+            res[f"p{p}_decisao_us"] = h.percentil(p)
+        por_fila = {}
+        for bits, h in sorted(self._por_fila.items()):
+            faixa = str(bits) if bits <= 1 else f"{1 << (bits - 1)}-{(1 << bits) - 1}"
+            por_fila[faixa] = {"n": h.n, "avg": h.media(), **{f"p{p}": h.percentil(p) for p in PERCENTIS}}
+        res["decisao_us_por_fila"] = por_fila
+        return res
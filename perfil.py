@@ -0,0 +1,84 @@
+import threading
+from time import perf_counter_ns
+
+import tabulate
+
+from metricas import histograma
+
+# Métodos medidos: (caminho a partir do escalonador, nome do método, fase)
+FASES = (
+    ("", "tick", "tick"),
+    ("", "tick_evento", "tick"),
+    ("", "_escalonar", "escalonar"),
+    ("", "_liberar_chegadas", "chegadas"),
+    ("algoritmo", "selecionar", "algoritmo"),
+    ("", "_executar", "execucao"),
+    ("", "registrar_tick", "registro"),
+    ("", "montar_quadro", "quadro"),
+    ("tela", "desenhar", "desenho"),
+)
+
+
+class perfilador:
+    """Medição opcional do tempo gasto em cada fase da simulação (chegadas,
+    decisão do algoritmo, execução, registro do histórico, montagem e desenho
+    do quadro), com perf_counter_ns. instrumentar() troca os métodos de um
+    escalonador por versões medidas só naquela instância: sem perfilador o
+    código do escalonador não muda e não paga nada.
+
+    Cada fase guarda um histograma das durações (µs) e cada pilha de fases
+    ("tick;escalonar;algoritmo") o seu tempo próprio, para o formato de
+    pilhas colapsadas dos flame graphs."""
+
+    def __init__(self):
+        self.fases = {}  # fase -> histograma das durações de cada chamada (µs)
+        self.pilhas = {}  # "fase;subfase;..." -> tempo próprio (ns), sem o das subfases
+        self._local = threading.local()  # Pilha de fases abertas de cada thread (o desenho tem a sua)
+
+    def instrumentar(self, escalonador):
+        for caminho, metodo, fase in FASES:
+            alvo = getattr(escalonador, caminho) if caminho else escalonador
+            setattr(alvo, metodo, self._medir(getattr(alvo, metodo), fase))
+        return escalonador
+
+    def _medir(self, funcao, fase):
+        local = self._local
+
+        def medida(*args, **kwargs):
+            pilha = getattr(local, "pilha", None)
+            if pilha is None:
+                pilha = local.pilha = []
+            aberta = [f"{pilha[-1][0]};{fase}" if pilha else fase, 0]  # [pilha, tempo das subfases]
+            pilha.append(aberta)
+            inicio = perf_counter_ns()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                duracao = perf_counter_ns() - inicio
+                pilha.pop()
+                if pilha:
+                    pilha[-1][1] += duracao
+                self._registrar(fase, aberta[0], duracao, duracao - aberta[1])
+        return medida
+
+    def _registrar(self, fase, caminho, duracao, propria):
+        h = self.fases.get(fase)
+        if h is None:
+            h = self.fases[fase] = histograma(resolucao=0.1)
+        h.registrar(duracao / 1000)
+        self.pilhas[caminho] = self.pilhas.get(caminho, 0) + propria
+
+    def relatorio(self):
+        """Tabela com chamadas, total e distribuição (µs) de cada fase."""
+        linhas = []
+        for fase, h in sorted(self.fases.items(), key=lambda item: -item[1].soma):
+            linhas.append([fase, h.n, f"{h.soma / 1000:.1f}", f"{h.media():.1f}", f"{h.percentil(50):.1f}",
+                           f"{h.percentil(99):.1f}", f"{h.maximo:.1f}"])
+        return tabulate.tabulate(linhas, headers=["fase", "chamadas", "total (ms)", "média (µs)", "p50 (µs)",
+                                                  "p99 (µs)", "máx (µs)"])
+
+    def pilhas_colapsadas(self, raiz=None):
+        """Linhas "raiz;fase;subfase tempo_próprio_em_µs", o formato de entrada do
+        flamegraph.pl / speedscope / inferno."""
+        prefixo = raiz.replace(" ", "_").replace(";", "_") + ";" if raiz else ""
+        return [f"{prefixo}{caminho} {ns // 1000}" for caminho, ns in sorted(self.pilhas.items()) if ns >= 1000]
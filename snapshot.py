@@ -1,9 +1,131 @@
-import copy
-
-class snapshot:
-    def __init__(self, processos, tempo, algoritimo=None, preemptable=None, at_overload=False):
-        self.algoritimo = algoritimo
-        self.preemptable = preemptable
-        self.processos = copy.deepcopy(processos)
-        self.tempo = tempo
-        self.at_overload = at_overload
\ No newline at end of file
+from array import array
+from bisect import bisect_left, bisect_right
+from enum import Enum
+
+from task import TaskState
+
+class instantType(Enum):
+    OVERLOAD = 0
+    WAITING = 1
+    HALF_WAITING = 2
+    EXECUTING = 3
+    FINALIZED = 4
+    NOT_ON_LIST = 5
+
+# Estados que podem mudar de uma coluna para a outra sem que o escalonador mexa na tarefa
+_VOLATEIS = (instantType.OVERLOAD, instantType.HALF_WAITING, instantType.EXECUTING)
+
+class timeline:
+    """Histórico compacto da simulação, no lugar de uma cópia das tarefas a cada tick.
+    Cada tick é uma coluna (tempo ao fim do tick e se foi sobrecarga). Para cada
+    tarefa guarda só os intervalos em que o estado dela se manteve (run-length):
+    a coluna onde o intervalo começa e o código do estado, em arrays compactos."""
+
+    def __init__(self):
+        self.tempos = array('d')  # Tempo ao fim de cada coluna
+        self.sobrecargas = array('b')  # 1 se a coluna foi de sobrecarga
+        self.tarefas = []
+        self._indice = {}  # tarefa -> posição em self.tarefas
+        self._inicios = []  # Por tarefa: coluna onde começa cada intervalo
+        self._codigos = []  # Por tarefa: código do estado de cada intervalo
+        self._por_chegada = []  # (chegada, índice) ainda não visíveis como espera
+        self._ordenado = True
+        self._volateis = set()  # Índices com estado que pode mudar sozinho
+        self._atuais = ()  # Tarefas nos processadores na última coluna
+        self._em_sobrecarga = set()  # Tarefas saindo dos processadores na última coluna
+
+    def __len__(self):
+        return len(self.tempos)
+
+    def adicionar_tarefa(self, tarefa):
+        i = len(self.tarefas)
+        self.tarefas.append(tarefa)
+        self._indice[tarefa] = i
+        self._inicios.append(array('l'))
+        self._codigos.append(array('b'))
+        self._por_chegada.append((tarefa.chegada, i))
+        self._ordenado = False
+
+    def registrar(self, tempo, at_overload, executando, em_sobrecarga=()):
+        """Adiciona a coluna de um tick. executando são as tarefas que o
+        escalonador tem nos processadores e em_sobrecarga as que estão saindo
+        deles numa troca de contexto; só elas, as da coluna anterior, as que
+        passaram a ser visíveis e as de estado volátil são reclassificadas."""
+        anterior = self.tempos[-1] if self.tempos else 0
+        coluna = len(self.tempos)
+        self.tempos.append(tempo)
+        self.sobrecargas.append(1 if at_overload else 0)
+
+        alteradas = self._volateis
+        self._volateis = set()
+        for t in (*self._atuais, *executando, *em_sobrecarga):
+            if t is not None:
+                alteradas.add(self._indice[t])
+        self._atuais = tuple(executando)
+        self._em_sobrecarga = set(em_sobrecarga)
+        # Tarefas que chegaram até este tempo passam a aparecer em espera
+        if not self._ordenado:
+            self._por_chegada.sort(reverse=True)
+            self._ordenado = True
+        while self._por_chegada and self._por_chegada[-1][0] < tempo:
+            alteradas.add(self._por_chegada.pop()[1])
+
+        for i in sorted(alteradas):
+            tipo, falhou = self._classificar(self.tarefas[i], tempo, anterior, at_overload)
+            if tipo in _VOLATEIS:
+                self._volateis.add(i)
+            codigo = tipo.value * 2 + falhou
+            codigos = self._codigos[i]
+            if not codigos or codigos[-1] != codigo:
+                self._inicios[i].append(coluna)
+                codigos.append(codigo)
+
+    def _classificar(self, t, tempo, anterior, at_overload):
+        if at_overload and t in self._em_sobrecarga:
+            return instantType.OVERLOAD, t.taskFailed
+        if t.estado == TaskState.EXECUTANDO:
+            return instantType.EXECUTING, t.taskFailed
+        if t.estado == TaskState.PRONTO and tempo > t.chegada:
+            if anterior < t.chegada:
+                return instantType.HALF_WAITING, t.taskFailed
+            return instantType.WAITING, t.taskFailed
+        if t.estado == TaskState.FINALIZADO:
+            return instantType.FINALIZED, False
+        return instantType.NOT_ON_LIST, t.taskFailed
+
+    def estado_na_coluna(self, i, coluna):
+        """Estado (instantType, falhou) da tarefa de índice i na coluna dada."""
+        k = bisect_right(self._inicios[i], coluna) - 1
+        if k < 0:
+            return instantType.NOT_ON_LIST, False
+        codigo = self._codigos[i][k]
+        return instantType(codigo >> 1), bool(codigo & 1)
+
+    def estado(self, tarefa, tempo):
+        """Estado (instantType, falhou) da tarefa no tempo dado, por bisseção.
+        A coluna k cobre o intervalo (tempos[k-1], tempos[k]]."""
+        coluna = min(bisect_left(self.tempos, tempo), len(self.tempos) - 1)
+        return self.estado_na_coluna(self._indice[tarefa], coluna)
+
+    def janela(self, inicio, fim=None):
+        """Estados de cada tarefa nas colunas [inicio, fim): uma lista por
+        tarefa, com um (instantType, falhou) por coluna."""
+        fim = len(self.tempos) if fim is None else fim
+        resultado = []
+        for i in range(len(self.tarefas)):
+            inicios, codigos = self._inicios[i], self._codigos[i]
+            k = bisect_right(inicios, inicio) - 1
+            linha = []
+            for coluna in range(inicio, fim):
+                while k + 1 < len(inicios) and inicios[k + 1] <= coluna:
+                    k += 1
+                if k < 0:
+                    linha.append((instantType.NOT_ON_LIST, False))
+                else:
+                    linha.append((instantType(codigos[k] >> 1), bool(codigos[k] & 1)))
+            resultado.append(linha)
+        return resultado
+
+    def colunas(self, inicio, fim=None):
+        """Tempos e flags de sobrecarga das colunas [inicio, fim)."""
+        return self.tempos[inicio:fim], self.sobrecargas[inicio:fim]
@@ -1,4 +1,6 @@
 import random
+from array import array
+from dataclasses import dataclass
 from enum import Enum
 
 class TaskState(Enum):
@@ -6,51 +8,260 @@ class TaskState(Enum):
     EXECUTANDO = "executando"
     FINALIZADO = "finalizado"
 
+_ESTADOS = tuple(TaskState)  # código (posição) -> estado
+_CODIGO_ESTADO = {estado: i for i, estado in enumerate(_ESTADOS)}
+_NAN = float('nan')  # Tempo ainda não calculado (None na API de objeto)
+
+def _opcional(valor):
+    return None if valor != valor else valor
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """Definição imutável de uma tarefa (os dados de entrada). Hashable e
+    compartilhável entre simulações e processos; o estado de execução fica
+    em TaskRuntime."""
+    nome: str
+    chegada: float
+    duracao: float
+    deadline: float = None  # Relativo à chegada; None = sem deadline
+    prioridade: int = 0
+
+class tabela_tarefas:
+    """Especificações das tarefas guardadas em colunas (struct of arrays) em vez
+    de um objeto por tarefa. As colunas ficam em arrays inteiros ('q') enquanto
+    todos os valores forem inteiros, e passam para 'd' no primeiro valor
+    fracionário. A tabela não guarda estado de execução: ela pode ser reutilizada
+    por qualquer número de simulações (cada uma com o seu TaskRuntime) e é
+    enviada uma única vez para os workers."""
+
+    def __init__(self):
+        self.nomes = []
+        self.cores = array('B')  # Cor aleatória para o terminal
+        self.chegada = array('q')
+        self.duracao = array('q')
+        self.deadline = array('q')  # Deadline relativo, como na entrada
+        self.deadline_absoluto = array('q')  # chegada + deadline
+        self.sem_deadline = bytearray()  # 1 se a tarefa não tem deadline (infinito)
+        self.prioridade = array('q')
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def __iter__(self):
+        for i in range(len(self.nomes)):
+            yield self.spec(i)
+
+    def spec(self, i):
+        """TaskSpec da tarefa de índice i."""
+        return TaskSpec(self.nomes[i], self.chegada[i], self.duracao[i],
+                        None if self.sem_deadline[i] else self.deadline[i], self.prioridade[i])
+
+    def adicionar(self, nome, chegada, duracao, deadline=None, prioridade=0):
+        """Adiciona uma tarefa e retorna o seu índice."""
+        i = len(self.nomes)
+        self.nomes.append(nome)
+        self.cores.append(random.randint(0, 255))
+        self._anexar("chegada", chegada)
+        self._anexar("duracao", duracao)
+        # Deadline is optional, defaults to infinity
+        self._anexar("deadline", deadline if deadline is not None else 0)
+        self._anexar("deadline_absoluto", chegada + deadline if deadline is not None else 0)
+        self.sem_deadline.append(deadline is None)
+        self._anexar("prioridade", prioridade)
+        return i
+
+    @classmethod
+    def de_specs(cls, specs):
+        """Monta uma tabela com as TaskSpec dadas."""
+        tabela = cls()
+        for spec in specs:
+            tabela.adicionar(spec.nome, spec.chegada, spec.duracao, spec.deadline, spec.prioridade)
+        return tabela
+
+    def _anexar(self, coluna, valor):
+        col = getattr(self, coluna)
+        if col.typecode == 'q' and not isinstance(valor, int):
+            col = array('d', col)
+            setattr(self, coluna, col)
+        col.append(valor)
+
+class TaskRuntime:
+    """Estado de execução de uma simulação sobre uma tabela_tarefas, também em
+    colunas. Criar um TaskRuntime novo é o que começa uma simulação do zero:
+    custa só a alocação dos arrays, sem copiar objetos de tarefa. As visões
+    (TarefaCAV) são criadas na primeira vez que cada tarefa é pedida, e tarefas
+    adicionadas à tabela depois da criação entram no runtime sob demanda."""
+
+    def __init__(self, tabela):
+        self.tabela = tabela
+        self.restante = array('d')  # Tempo restante para completar a tarefa
+        self.estado = bytearray()  # Código do estado (posição em TaskState)
+        self.response_time = array('d')  # Tempo de resposta 1ra execução
+        self.turn_around_time = array('d')  # Tempo de retorno
+        self.wait_time = array('d')  # Tempo de espera
+        self.falhou = bytearray()  # 1 se a tarefa falhou (estourou deadline)
+        self._visoes = []  # Visão de cada tarefa, criada na primeira vez que é pedida
+        self._sincronizar()
+
+    def __len__(self):
+        return len(self.tabela)
+
+    def __iter__(self):
+        for i in range(len(self.tabela)):
+            yield self.tarefa(i)
+
+    def tarefa(self, i):
+        """Visão (TarefaCAV) da tarefa de índice i. Sempre a mesma instância para o mesmo i."""
+        if i >= len(self._visoes):
+            self._sincronizar()
+        visao = self._visoes[i]
+        if visao is None:
+            visao = object.__new__(TarefaCAV)
+            visao._exec = self
+            visao._i = i
+            self._visoes[i] = visao
+        return visao
+
+    def _sincronizar(self):
+        # Estende as colunas para as tarefas novas da tabela e atualiza as
+        # referências às colunas estáticas (que podem ter mudado de tipo)
+        tabela = self.tabela
+        novas = len(tabela) - len(self._visoes)
+        self.restante.extend(array('d', tabela.duracao[len(self._visoes):]))
+        self.estado.extend(bytes(novas))
+        nan = array('d', [_NAN]) * novas
+        self.response_time.extend(nan)
+        self.turn_around_time.extend(nan)
+        self.wait_time.extend(nan)
+        self.falhou.extend(bytes(novas))
+        self._visoes.extend([None] * novas)
+        self.chegada = tabela.chegada
+        self.duracao = tabela.duracao
+        self.deadline = tabela.deadline_absoluto
+        self.sem_deadline = tabela.sem_deadline
+
 class TarefaCAV:
+    """Visão de uma tarefa de um TaskRuntime. TarefaCAV(...) cria uma tarefa
+    avulsa, com uma tabela e um runtime próprios de uma linha."""
+    __slots__ = ("_exec", "_i")
+
     def __init__(self, nome, chegada, duracao, deadline = None, prioridade=0):
-        self.color = random.randint(0, 255)  # Random color for terminal output
-        self.nome = nome # Nome da tarefa 
-        self.prioridade = prioridade # Prioridade da tarefa (quanto menor o número, maior a prioridade)
-        self.chegada = chegada # Tempo de chegada
-        self.duracao = duracao # Burst time
-        self.deadline = chegada + (deadline if deadline is not None else float('inf')) # Deadline is optional, defaults to infinity
-        self.restante = duracao # Tempo restante para completar a tarefa
-        self.estado = TaskState.PRONTO  # Estado inicial do processo
-        self.response_time = None # Tempo de resposta 1ra execução
-        self.turn_around_time = None # Tempo de retorno
-        self.wait_time = None # Tempo de espera
-        self.taskFailed = False # Indica se a tarefa falhou (estourou deadline)
+        tabela = tabela_tarefas()
+        self._i = tabela.adicionar(nome, chegada, duracao, deadline, prioridade)
+        self._exec = TaskRuntime(tabela)
+        self._exec._visoes[self._i] = self
         # self.coreAfinity = None  # pinneToCore
-        # self.softCoreAfinity = None  # set and managed by the SO to avoid task migration 
+        # self.softCoreAfinity = None  # set and managed by the SO to avoid task migration
+
+    @property
+    def spec(self):
+        return self._exec.tabela.spec(self._i)
+
+    @property
+    def nome(self):
+        return self._exec.tabela.nomes[self._i]
+
+    @property
+    def color(self):
+        return self._exec.tabela.cores[self._i]
+
+    @property
+    def chegada(self):
+        return self._exec.chegada[self._i]
+
+    @property
+    def duracao(self):
+        return self._exec.duracao[self._i]
+
+    @property
+    def prioridade(self):
+        return self._exec.tabela.prioridade[self._i]
+
+    @property
+    def deadline(self):
+        if self._exec.sem_deadline[self._i]:
+            return float('inf')
+        return self._exec.deadline[self._i]
+
+    @property
+    def restante(self):
+        return self._exec.restante[self._i]
+
+    @restante.setter
+    def restante(self, valor):
+        self._exec.restante[self._i] = valor
+
+    @property
+    def estado(self):
+        return _ESTADOS[self._exec.estado[self._i]]
+
+    @estado.setter
+    def estado(self, valor):
+        self._exec.estado[self._i] = _CODIGO_ESTADO[valor]
+
+    @property
+    def response_time(self):
+        return _opcional(self._exec.response_time[self._i])
+
+    @property
+    def turn_around_time(self):
+        return _opcional(self._exec.turn_around_time[self._i])
+
+    @property
+    def wait_time(self):
+        return _opcional(self._exec.wait_time[self._i])
+
+    @property
+    def taskFailed(self):
+        return bool(self._exec.falhou[self._i])
 
     def executar(self, tempo_atual, time_slice=1, continue_after_deadline=True):
-        
-        tempo_execucao = min(self.restante, time_slice)
+        tabela, i = self._exec, self._i
+        restante = tabela.restante[i]
+        tempo_execucao = min(restante, time_slice)
 
         # Set the response time on the first execution
-        if self.duracao == self.restante:
-            self.response_time = tempo_atual - self.chegada
+        if tabela.duracao[i] == restante:
+            tabela.response_time[i] = tempo_atual - tabela.chegada[i]
         # Executa a tarefa por um tempo de 'time_slice' ou até terminar
-        if self.restante > 0:
-            self.restante -= time_slice
+        if restante > 0:
+            restante -= time_slice
+            tabela.restante[i] = restante
         tempo = tempo_atual + tempo_execucao
-        if tempo > self.deadline and self.restante > 0:
-            self.taskFailed = True # indica que a tarefa estorou deadline
+        if tempo > self.deadline and restante > 0:
+            tabela.falhou[i] = 1 # indica que a tarefa estorou deadline
             if not continue_after_deadline:
-                self.restante = 0
+                tabela.restante[i] = 0
                 self.finished(tempo)
                 return
-   
+
             # self.estado = TaskState.FINALIZADO
             # self.turn_around_time = tempo - self.chegada
             # self.wait_time = self.turn_around_time - self.duracao + self.restante
-        if self.restante == 0:
+        if restante == 0:
             self.finished(tempo)
 
         return tempo_execucao
 
+    def executar_fatias(self, tempo_atual, time_slice=1, n=1):
+        """Executa até n time slices seguidos (para antes se a tarefa terminar), com
+        o mesmo resultado de n chamadas a executar(): a conta é feita fatia a fatia,
+        porque com time slices fracionários multiplicar por n não dá o mesmo que somar."""
+        tempo = tempo_atual
+        tempo_execucao = 0
+        for _ in range(n):
+            passo = self.executar(tempo, time_slice)
+            if passo is None:
+                break
+            tempo += passo
+            tempo_execucao += passo
+            if self._exec.restante[self._i] <= 0:
+                break
+        return tempo_execucao
+
     def finished(self, end_time):
-        self.turn_around_time = end_time - self.chegada
-        self.wait_time = self.turn_around_time - self.duracao
+        tabela, i = self._exec, self._i
+        tabela.turn_around_time[i] = end_time - tabela.chegada[i]
+        tabela.wait_time[i] = tabela.turn_around_time[i] - tabela.duracao[i]
     def __str__(self):
-        return f"{self.nome} (Prioridade: {self.prioridade}, Chegada: {self.chegada}, Duração: {self.duracao}, Deadline: {self.deadline}, Estado: {self.estado})"
\ No newline at end of file
+        return f"{self.nome} (Prioridade: {self.prioridade}, Chegada: {self.chegada}, Duração: {self.duracao}, Deadline: {self.deadline}, Estado: {self.estado})"
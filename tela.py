@@ -0,0 +1,81 @@
+import re
+import sys
+
+import layout
+
+# Texto em pedaços: sequências de escape ANSI ou um caractere visível
+_PEDACOS = re.compile(r'\x1b[^m]*(?:m|$)|.', re.S)
+_RESET = '\x1b[0m'
+
+
+def celulas(linha, largura):
+    """Divide uma linha em células (estilo, caractere), uma por coluna visível,
+    até largura colunas. O estilo de uma célula são os escapes de cor aplicados
+    desde o último reset (\\x1b[0m)."""
+    res = []
+    estilo = ''
+    for pedaco in _PEDACOS.findall(linha):
+        if pedaco[0] == '\x1b':
+            estilo = '' if pedaco == _RESET else estilo + pedaco
+        else:
+            if len(res) >= largura:
+                break
+            res.append((estilo, pedaco))
+    return res
+
+
+class tela:
+    """Saída do terminal com buffer duplo. Guarda as células do último quadro
+    e, a cada quadro novo, escreve só os trechos de linha que mudaram (do
+    primeiro ao último caractere diferente), posicionando o cursor direto
+    neles. Tudo vai para o terminal numa única chamada a write() por quadro."""
+
+    def __init__(self, saida=None):
+        self.saida = saida if saida is not None else sys.stdout
+        self._anterior = None  # Células de cada linha do quadro na tela
+        self._tamanho = None
+
+    def desenhar(self, linhas):
+        tamanho = layout.tamanho_terminal()
+        partes = []
+        if tamanho != self._tamanho or self._anterior is None:
+            # Primeiro quadro ou terminal redimensionado: limpa e redesenha tudo
+            self._tamanho = tamanho
+            self._anterior = []
+            partes.append('\x1b[H\x1b[2J')
+        # A última linha do terminal fica livre, como no print linha a linha
+        linhas = linhas[:max(tamanho.lines - 1, 0)]
+        novas = [celulas(linha, tamanho.columns) for linha in linhas]
+        for r in range(max(len(novas), len(self._anterior))):
+            nova = novas[r] if r < len(novas) else []
+            antiga = self._anterior[r] if r < len(self._anterior) else []
+            if nova != antiga:
+                partes.append(self._trecho(r, nova, antiga))
+        self._anterior = novas
+        # Cursor no fim da tela, onde o próximo print (resultados, input) aparece
+        partes.append(f'\x1b[{tamanho.lines};1H')
+        self.saida.write(''.join(partes))
+        self.saida.flush()
+
+    def _trecho(self, r, nova, antiga):
+        # Primeira e última células diferentes entre as duas versões da linha
+        inicio = 0
+        limite = min(len(nova), len(antiga))
+        while inicio < limite and nova[inicio] == antiga[inicio]:
+            inicio += 1
+        fim = len(nova)
+        if len(nova) == len(antiga):
+            while fim > inicio and nova[fim - 1] == antiga[fim - 1]:
+                fim -= 1
+        partes = [f'\x1b[{r + 1};{inicio + 1}H', _RESET]
+        estilo = ''
+        for estilo_celula, caractere in nova[inicio:fim]:
+            if estilo_celula != estilo:
+                partes.append(_RESET + estilo_celula)
+                estilo = estilo_celula
+            partes.append(caractere)
+        partes.append(_RESET)
+        if len(nova) < len(antiga):
+            # Linha ficou mais curta: apaga o resto
+            partes.append('\x1b[K')
+        return ''.join(partes)
@@ -0,0 +1,38 @@
+import unittest
+
+import algoritimos
+from escalonador import escalonador
+from task import TaskRuntime, TaskSpec, tabela_tarefas
+
+
+def montar(algoritmo, specs, **kwargs):
+    e = escalonador(algoritmo, headless=True, **kwargs)
+    for tarefa in TaskRuntime(tabela_tarefas.de_specs(specs)):
+        e.adicionar_tarefa(tarefa)
+    return e
+
+
+class test_multinucleo(unittest.TestCase):
+    def test_sobrecarga_dura_o_tick_inteiro(self):
+        # Os processadores avançam juntos: o tick dura o passo mais longo, então
+        # um processador em sobrecarga enquanto outro executa fica parado o
+        # resto do time slice (a troca custa max(sobrecarga, time slice))
+        e = montar(algoritimos.escalonador_rr(quantum=2), [TaskSpec("A", 0, 4), TaskSpec("B", 1, 4)],
+                   time_slice=1, sobrecarga=0.6, nucleos=2)
+        ticks = []
+        while e._pendente():
+            antes = e.tempo
+            e.tick()
+            ticks.append((e.tempo - antes, [n.at_overload for n in e.nucleos]))
+        mistos = [duracao for duracao, sobrecarga in ticks if any(sobrecarga) and not all(sobrecarga)]
+        self.assertEqual(mistos, [1, 1])
+        resultado = e.resultado()
+        # Só o custo das trocas entra no tempo de sobrecarga; o resto do tick não entra na utilização
+        self.assertEqual(resultado["n_overload"], 2)
+        self.assertAlmostEqual(resultado["total_overload_time"], 1.2)
+        self.assertEqual(resultado["tempo_total"], 6)
+        self.assertEqual(resultado["utilizacao_nucleos"], [4 / 6, 4 / 6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import random
+import unittest
+
+import algoritimos
+from entrada import carregar_json
+from escalonador import escalonador
+from task import TaskRuntime
+
+PASTA = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ALGORITMOS = [
+    ("fcfs", {}),
+    ("sjf", {"preemptive": True}),
+    ("rr", {"quantum": 2}),
+    ("priority", {"preemptive": True}),
+    ("edf", {"preemptive": True}),
+    ("edf", {"preemptive": False}),
+    ("hrrn", {"preemptive": True}),
+    ("lottery", {"preemptive": True, "seed": 1}),
+]
+
+
+def simular(motor, arquivo, alg, opts, time_slice, sobrecarga, nucleos=1):
+    """Roda uma simulação headless e retorna o resultado sem as latências de decisão (medidas em tempo real)."""
+    _, tabela = carregar_json(os.path.join(PASTA, arquivo))
+    random.seed(1)
+    algoritmo = getattr(algoritimos, "escalonador_" + alg)(**opts)
+    e = escalonador(algoritmo, time_slice=time_slice, sobrecarga=sobrecarga,
+                    headless=True, motor=motor, nucleos=nucleos)
+    for tarefa in TaskRuntime(tabela):
+        e.adicionar_tarefa(tarefa)
+    e.simular_sync(0)
+    return {k: v for k, v in e.resultado().items() if "decisao_us" not in k}
+
+
+class test_motores(unittest.TestCase):
+    def comparar(self, time_slice, sobrecarga, nucleos=1):
+        for arquivo in ("example.json", "hrrn.json"):
+            for alg, opts in ALGORITMOS:
+                with self.subTest(arquivo=arquivo, alg=alg, opts=opts):
+                    self.assertEqual(simular("tick", arquivo, alg, opts, time_slice, sobrecarga, nucleos),
+                                     simular("eventos", arquivo, alg, opts, time_slice, sobrecarga, nucleos))
+
+    def test_time_slice_inteiro(self):
+        self.comparar(1, 0.6)
+
+    def test_time_slice_fracionario(self):
+        # Com fatias fracionárias as contas de ponto flutuante têm que ser as mesmas nos dois motores
+        self.comparar(0.3, 0.6)
+        self.comparar(1.5, 0.2)
+
+    def test_multinucleo_fracionario(self):
+        self.comparar(0.3, 0.6, nucleos=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import csv
+import io
+import os
+import unittest
+
+import algoritimos
+import varredura
+from entrada import carregar_json
+from escalonador import escalonador
+from task import TaskRuntime
+
+PASTA = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class test_varredura(unittest.TestCase):
+    def setUp(self):
+        _, self.tarefas = carregar_json(os.path.join(PASTA, "example.json"))
+
+    def resultado(self, nucleos):
+        e = escalonador(algoritimos.escalonador_rr(quantum=2), headless=True, nucleos=nucleos)
+        for tarefa in TaskRuntime(self.tarefas):
+            e.adicionar_tarefa(tarefa)
+        e.simular_sync(0)
+        return e.resultado()
+
+    def test_cabecalho_tem_todas_as_metricas(self):
+        algoritmos = [(algoritimos.escalonador_rr, {"quantum": 2}), (algoritimos.escalonador_edf, {"preemptive": True})]
+        for nucleos in (1, 2):
+            with self.subTest(nucleos=nucleos):
+                grade = varredura.montar_grade({"time_slice": [1, 2]}, 1, 0.6)
+                saida = io.StringIO()
+                varredura.escrever_csv(varredura.varrer(algoritmos, self.tarefas, grade, nucleos=nucleos), saida, nucleos=nucleos)
+                linhas = list(csv.reader(io.StringIO(saida.getvalue())))
+                esperado = ["ponto", "algoritmo", *varredura.DIMENSOES, *self.resultado(nucleos)]
+                self.assertEqual(linhas[0], esperado)
+                self.assertEqual(len(linhas), 1 + len(algoritmos) * 2)
+                for linha in linhas[1:]:
+                    self.assertEqual(len(linha), len(esperado))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import csv
+import itertools
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from algoritimos import escalonador_fcfs
+from escalonador import escalonador as Escalonador
+from task import TaskRuntime, tabela_tarefas
+
+# Dimensões da varredura, na ordem em que aparecem nas linhas da tabela
+DIMENSOES = ("time_slice", "sobrecarga", "quantum", "preemptive")
+
+_TAREFAS = None  # tabela_tarefas (ou fluxo_tarefas) do worker, recebida uma vez por processo
+
+
+def ler_valores(texto, tipo=float):
+    """Converte a especificação de uma dimensão da linha de comando em uma lista
+    de valores: "a:b:passo" (intervalo fechado) ou "v1,v2,..." ("none" = padrão
+    do algoritmo)."""
+    if ":" in texto:
+        inicio, fim, passo = (float(v) for v in texto.split(":"))
+        if passo <= 0:
+            raise ValueError(f"Passo inválido na varredura: {texto}")
+        n = int(round((fim - inicio) / passo)) + 1
+        return [tipo(round(inicio + i * passo, 10)) for i in range(max(n, 0))]
+    valores = []
+    for v in texto.split(","):
+        v = v.strip().lower()
+        if v == "none":
+            valores.append(None)
+        elif tipo is bool:
+            valores.append(v in ("true", "1", "sim"))
+        else:
+            valores.append(tipo(v))
+    return valores
+
+
+def montar_grade(bloco, time_slice, sobrecarga):
+    """Completa um bloco "sweep" com os valores padrão. Dimensões ausentes
+    usam o -ts/-c da linha de comando ou as opções do próprio algoritmo (None)."""
+    grade = {"time_slice": [time_slice], "sobrecarga": [sobrecarga], "quantum": [None], "preemptive": [None]}
+    for chave, valores in bloco.items():
+        if chave not in grade:
+            raise ValueError(f"Dimensão de varredura desconhecida: {chave}")
+        grade[chave] = valores if isinstance(valores, list) else [valores]
+    return grade
+
+
+def pontos(algoritmos, grade):
+    """Gera (índice, algoritmo, opções, time_slice, sobrecarga) para cada ponto do
+    produto cartesiano da grade com a lista de algoritmos, sem materializá-lo."""
+    produto = itertools.product(algoritmos, *(grade[d] for d in DIMENSOES))
+    for i, ((alg, opts), ts, c, quantum, preemptive) in enumerate(produto):
+        opts = dict(opts or {})
+        if quantum is not None:
+            opts["quantum"] = quantum
+        if preemptive is not None:
+            opts["preemptive"] = preemptive
+        yield i, alg, opts, ts, c
+
+
+def colunas(nucleos=1):
+    """Colunas da tabela: o ponto, as dimensões e as chaves de escalonador.resultado()
+    na ordem em que ele as retorna. As chaves vêm de um escalonador vazio com a
+    mesma configuração dos pontos, então a tabela acompanha o que resultado() reporta."""
+    vazio = Escalonador(escalonador_fcfs(), headless=True, nucleos=nucleos)
+    return ("ponto", "algoritmo") + DIMENSOES + tuple(vazio.resultado())
+
+
+def _celula(valor):
+    # Listas (nomes das falhas, utilização por processador) e as faixas de fila vão como json
+    return json.dumps(valor, ensure_ascii=False) if isinstance(valor, (list, dict)) else valor
+
+
+def _iniciar_worker(tarefas):
+    global _TAREFAS
+    _TAREFAS = tarefas
+
+
+def simular_ponto(indice, alg, opts, time_slice, sobrecarga, motor="tick", nucleos=1):
+    """Simula um ponto da varredura sem renderização e retorna a linha da tabela."""
+    algoritimo = alg(**opts)
+    escalonador = Escalonador(algoritimo, time_slice=time_slice, sobrecarga=sobrecarga,
+                              headless=True, motor=motor, nucleos=nucleos)
+    if isinstance(_TAREFAS, tabela_tarefas):
+        for tarefa in TaskRuntime(_TAREFAS):
+            escalonador.adicionar_tarefa(tarefa)
+    else:
+        escalonador.adicionar_fonte(_TAREFAS)
+    escalonador.simular_sync(0)
+    resultado = escalonador.resultado()
+    linha = {"ponto": indice, "algoritmo": algoritimo.name, "time_slice": time_slice,
+             "sobrecarga": sobrecarga, "quantum": algoritimo.quantum, "preemptive": algoritimo.preemptive}
+    linha.update((m, _celula(v)) for m, v in resultado.items())
+    return linha
+
+
+def varrer(algoritmos, tarefas, grade, jobs=1, motor="tick", nucleos=1):
+    """Gera as linhas da varredura à medida que os pontos terminam. Com jobs > 1
+    os pontos rodam em paralelo, com no máximo 2*jobs pontos pendentes por vez,
+    então a memória não cresce com o tamanho da grade (as linhas saem fora de
+    ordem; a coluna "ponto" guarda a posição original)."""
+    if jobs <= 1:
+        _iniciar_worker(tarefas)
+        for ponto in pontos(algoritmos, grade):
+            yield simular_ponto(*ponto, motor=motor, nucleos=nucleos)
+        return
+
+    # As tarefas vão para cada worker uma única vez, não a cada ponto
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_iniciar_worker, initargs=(tarefas,)) as pool:
+        pendentes = set()
+        for ponto in pontos(algoritmos, grade):
+            if len(pendentes) >= 2 * jobs:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    yield futuro.result()
+            pendentes.add(pool.submit(simular_ponto, *ponto, motor=motor, nucleos=nucleos))
+        for futuro in wait(pendentes).done:
+            yield futuro.result()
+
+
+def escrever_csv(linhas, saida, nucleos=1):
+    """Escreve as linhas em CSV, uma a uma, liberando o buffer a cada linha."""
+    escritor = csv.DictWriter(saida, fieldnames=colunas(nucleos))
+    escritor.writeheader()
+    for linha in linhas:
+        escritor.writerow(linha)
+        saida.flush()